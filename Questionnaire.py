@@ -19,8 +19,16 @@ Date: 2025
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
+import tkinter.font as tkfont
 import pickle
 import os
+import sqlite3
+import threading
+import time
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 import re
@@ -30,15 +38,42 @@ import json
 # Imports pour Gemini
 import google.generativeai as genai
 
+# rapidfuzz (optionnel) calcule le ratio de similarité en C++
+try:
+    from rapidfuzz import fuzz
+    def _ratio(a, b):
+        return fuzz.ratio(a, b) / 100.0
+except ImportError:
+    def _ratio(a, b):
+        return SequenceMatcher(None, a, b).ratio()
+
+# orjson (optionnel) décode plus vite les réponses JSON de Gemini
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # ============================================================================
 # CONFIGURATION ET UTILITAIRES
 # ============================================================================
 
+# Expressions et listes utilisées à chaque normalisation : construites une seule fois
+_PONCTUATION_RE = re.compile(r'[^\w\s]')
+_MOTS_VIDES = frozenset({'le', 'la', 'les', 'un', 'une', 'des', 'de', 'du',
+                         'à', 'et', 'ou', 'est', 'sont', 'dans', 'sur', 'pour'})
+# Lignes non vides d'un champ texte, sans les blancs en début et fin de ligne
+_NONEMPTY_LINE = re.compile(r'^[^\S\n]*(\S.*?)[^\S\n]*$', re.M)
+
 class Config:
     """Configuration globale de l'application"""
     QUESTIONS_DIR = "questions_db"
     REPONSES_DIR = "reponses_utilisateur"
     QUESTION_PREFIX = "question_"
+    QUESTIONS_DB = "questions.sqlite3"
+    # Anciens formats, lus uniquement pour la migration vers SQLite
+    QUESTIONS_INDEX = "index.pkl"
+    IO_BUFFER = 64 * 1024  # tampon des lectures pickle
     
     # Couleurs
     COLOR_PRIMARY = "#2c3e50"
@@ -48,69 +83,157 @@ class Config:
     COLOR_BG = "#ecf0f1"
 
 class QuestionManager:
-    """Gestionnaire de questions - Gestion de la sauvegarde et du chargement"""
+    """
+    Gestionnaire de questions - Gestion de la sauvegarde et du chargement
+    Les questions sont stockées dans une base SQLite (une ligne par question)
+    """
+    
+    _COLONNES = ('numero', 'titre', 'enonce', 'fichiers', 'reponse_attendue',
+                 'points_obligatoires', 'erreurs_a_eviter', 'date_creation', 'date_creation_ns',
+                 'version')
+    _COLONNES_LISTES = ('fichiers', 'points_obligatoires', 'erreurs_a_eviter')  # stockées en JSON
+    _DEFAUTS = {'version': 1, 'date_creation_ns': None}  # les autres colonnes valent ''
     
     def __init__(self):
         self.questions_dir = Path(Config.QUESTIONS_DIR)
         self.reponses_dir = Path(Config.REPONSES_DIR)
         self._init_directories()
+        
+        self.db = sqlite3.connect(self.questions_dir / Config.QUESTIONS_DB)
+        self._init_db()
+        
+        # Cache mémoire {numero: titre} et prochain numéro, valides tant que
+        # PRAGMA data_version (jeton de génération) ne change pas
+        self._titres = None
+        self._data_version = None
+        self._next_num = None
+        # Fonctions appelées après chaque sauvegarde réussie
+        self.on_modified = []
     
     def _init_directories(self):
         """Crée les dossiers nécessaires s'ils n'existent pas"""
         self.questions_dir.mkdir(exist_ok=True)
         self.reponses_dir.mkdir(exist_ok=True)
     
-    def get_next_question_number(self):
-        """Génère le prochain numéro de question disponible"""
-        existing_files = list(self.questions_dir.glob(f"{Config.QUESTION_PREFIX}*.pkl"))
-        if not existing_files:
-            return 1
-        
-        numbers = []
-        for file in existing_files:
+    def _init_db(self):
+        """Crée la table si besoin et importe les anciennes questions pickle"""
+        with self.db:
+            self.db.execute("""
+                CREATE TABLE IF NOT EXISTS questions (
+                    numero INTEGER PRIMARY KEY,
+                    titre TEXT NOT NULL DEFAULT '',
+                    enonce TEXT NOT NULL DEFAULT '',
+                    fichiers TEXT NOT NULL DEFAULT '[]',
+                    reponse_attendue TEXT NOT NULL DEFAULT '',
+                    points_obligatoires TEXT NOT NULL DEFAULT '[]',
+                    erreurs_a_eviter TEXT NOT NULL DEFAULT '[]',
+                    date_creation TEXT,
+                    date_creation_ns INTEGER,
+                    version INTEGER NOT NULL DEFAULT 1
+                )
+            """)
+            colonnes = {ligne[1] for ligne in self.db.execute("PRAGMA table_info(questions)")}
+            if 'date_creation_ns' not in colonnes:
+                self.db.execute("ALTER TABLE questions ADD COLUMN date_creation_ns INTEGER")
+        if self.db.execute("SELECT 1 FROM questions LIMIT 1").fetchone() is None:
+            self._migrer_pickles()
+    
+    def _migrer_pickles(self):
+        """Importe une fois les questions des anciens fichiers question_*.pkl / index.pkl"""
+        questions = {}
+        fichiers = list(self.questions_dir.glob(f"{Config.QUESTION_PREFIX}*.pkl"))
+        index_file = self.questions_dir / Config.QUESTIONS_INDEX
+        if index_file.exists():
+            fichiers.append(index_file)  # en dernier : l'index contient les versions les plus récentes
+        
+        for file in fichiers:
             try:
-                num = int(file.stem.replace(Config.QUESTION_PREFIX, ""))
-                numbers.append(num)
-            except ValueError:
+                with open(file, 'rb', buffering=Config.IO_BUFFER) as f:
+                    contenu = pickle.load(f)
+            except Exception as e:
+                print(f"Erreur chargement {file}: {e}")
                 continue
+            for question in (contenu.values() if file == index_file else [contenu]):
+                questions[question['numero']] = question
         
-        return max(numbers) + 1 if numbers else 1
+        if questions:
+            with self.db:
+                self.db.executemany(self._SQL_ENREGISTRER, map(self._vers_ligne, questions.values()))
+    
+    _SQL_ENREGISTRER = (
+        f"INSERT OR REPLACE INTO questions ({', '.join(_COLONNES)}) "
+        f"VALUES ({', '.join('?' for _ in _COLONNES)})"
+    )
+    
+    def _vers_ligne(self, question_data):
+        """Dictionnaire question -> tuple de valeurs SQL"""
+        return tuple(
+            json.dumps(question_data.get(col) or [], ensure_ascii=False) if col in self._COLONNES_LISTES
+            else question_data.get(col, self._DEFAUTS.get(col, ''))
+            for col in self._COLONNES
+        )
+    
+    def _depuis_ligne(self, ligne):
+        """Tuple de valeurs SQL -> dictionnaire question"""
+        question = dict(zip(self._COLONNES, ligne))
+        for col in self._COLONNES_LISTES:
+            question[col] = json.loads(question[col])
+        return question
+    
+    def _rafraichir(self):
+        """Retourne le cache {numero: titre}, relu seulement si la base a changé"""
+        version = self.db.execute("PRAGMA data_version").fetchone()[0]
+        if self._titres is None or version != self._data_version:
+            self._titres = dict(self.db.execute("SELECT numero, titre FROM questions"))
+            self._next_num = max(self._titres, default=0) + 1
+            self._data_version = version
+        return self._titres
+    
+    def get_next_question_number(self):
+        """Génère le prochain numéro de question disponible"""
+        self._rafraichir()
+        return self._next_num
     
     def save_question(self, question_data):
-        """Sauvegarde une question au format pickle"""
+        """Sauvegarde une question dans la base"""
         question_num = question_data['numero']
-        filename = self.questions_dir / f"{Config.QUESTION_PREFIX}{question_num}.pkl"
         
         try:
-            with open(filename, 'wb') as f:
-                pickle.dump(question_data, f)
-            return True, f"Question {question_num} sauvegardée avec succès!"
+            with self.db:
+                # La version invalide les résultats d'évaluation mis en cache
+                ligne = self.db.execute(
+                    "SELECT version FROM questions WHERE numero = ?", (question_num,)
+                ).fetchone()
+                question_data['version'] = ligne[0] + 1 if ligne else 1
+                self.db.execute(self._SQL_ENREGISTRER, self._vers_ligne(question_data))
         except Exception as e:
             return False, f"Erreur lors de la sauvegarde : {str(e)}"
+        
+        # data_version ne change pas pour nos propres écritures : mise à jour sur place
+        self._rafraichir()[question_num] = question_data.get('titre', '')
+        self._next_num = max(self._next_num, question_num + 1)
+        for callback in list(self.on_modified):
+            callback()
+        return True, f"Question {question_num} sauvegardée avec succès!"
     
     def load_all_questions(self):
-        """Charge toutes les questions sauvegardées"""
-        questions = []
-        for file in self.questions_dir.glob(f"{Config.QUESTION_PREFIX}*.pkl"):
-            try:
-                with open(file, 'rb') as f:
-                    question = pickle.load(f)
-                    questions.append(question)
-            except Exception as e:
-                print(f"Erreur chargement {file}: {e}")
-        
-        # Trier par numéro
-        questions.sort(key=lambda x: x.get('numero', 0))
-        return questions
+        """Charge toutes les questions sauvegardées, triées par numéro"""
+        lignes = self.db.execute(
+            f"SELECT {', '.join(self._COLONNES)} FROM questions ORDER BY numero"
+        )
+        return [self._depuis_ligne(ligne) for ligne in lignes]
+    
+    def load_titles(self):
+        """Liste [(numero, titre)] triée, sans charger énoncés ni critères"""
+        return sorted(self._rafraichir().items())
     
     def load_question(self, question_num):
         """Charge une question spécifique"""
-        filename = self.questions_dir / f"{Config.QUESTION_PREFIX}{question_num}.pkl"
-        try:
-            with open(filename, 'rb') as f:
-                return pickle.load(f)
-        except Exception as e:
-            return None
+        ligne = self.db.execute(
+            f"SELECT {', '.join(self._COLONNES)} FROM questions WHERE numero = ?",
+            (question_num,)
+        ).fetchone()
+        return self._depuis_ligne(ligne) if ligne else None
 
 # ============================================================================
 # ANALYSEUR DE RÉPONSES (IA Hybride : Gemini + Local)
@@ -122,10 +245,21 @@ class ReponseAnalyzer:
     Utilise Gemini si disponible, sinon les techniques NLP locales
     """
     
+    TAILLE_CACHE_RESULTATS = 1024
+    
     def __init__(self):
         self.nlp = None
         self._init_nlp()
         
+        # Les points obligatoires / erreurs d'une question reviennent à chaque
+        # évaluation : leur normalisation et leurs mots-clés sont mémorisés
+        self._normaliser_point = lru_cache(maxsize=4096)(self.normaliser_texte)
+        self._mots_cles_point = lru_cache(maxsize=4096)(self.extraire_mots_cles)
+        
+        # (numero, version, empreinte de la réponse) -> (resultats, prompt)
+        self._cache_resultats = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
         self.gemini_model = None
         self._init_gemini()
     
@@ -134,7 +268,12 @@ class ReponseAnalyzer:
         try:
             import spacy
             try:
-                self.nlp = spacy.load("fr_core_news_md")
+                # Seuls les vecteurs, les POS et les lemmes servent : l'analyse
+                # syntaxique et les entités nommées ne sont pas chargées
+                self.nlp = spacy.load("fr_core_news_md", exclude=["parser", "ner"])
+                # Réponse attendue et points obligatoires sont identiques d'une
+                # évaluation à l'autre : on ne les analyse qu'une fois
+                self._nlp_cache = lru_cache(maxsize=1024)(self.nlp)
             except OSError:
                 print("Modèle français spaCy non trouvé. Utilisation du mode basique.")
                 self.nlp = None
@@ -159,15 +298,12 @@ class ReponseAnalyzer:
     
     def normaliser_texte(self, texte):
         """Normalise le texte pour comparaison"""
-        texte = texte.lower()
-        texte = re.sub(r'[^\w\s]', ' ', texte)
-        texte = ' '.join(texte.split())
-        return texte
+        return ' '.join(_PONCTUATION_RE.sub(' ', texte.lower()).split())
     
     def extraire_mots_cles(self, texte):
         """Extrait les mots-clés importants du texte"""
         if self.nlp:
-            doc = self.nlp(texte)
+            doc = self._nlp_cache(texte)
             mots_cles = [token.lemma_ for token in doc 
                         if token.pos_ in ['NOUN', 'VERB', 'ADJ'] 
                         and not token.is_stop]
@@ -175,27 +311,42 @@ class ReponseAnalyzer:
         else:
             texte_norm = self.normaliser_texte(texte)
             mots = texte_norm.split()
-            stop_words = {'le', 'la', 'les', 'un', 'une', 'des', 'de', 'du', 
-                         'à', 'et', 'ou', 'est', 'sont', 'dans', 'sur', 'pour'}
-            return set(mot for mot in mots if len(mot) > 3 and mot not in stop_words)
+            return set(mot for mot in mots if len(mot) > 3 and mot not in _MOTS_VIDES)
     
-    def calculer_similarite(self, texte1, texte2):
-        """Calcule la similarité entre deux textes (0 à 1)"""
+    def vecteur_normalise(self, texte):
+        """Vecteur spaCy du texte ramené à une norme de 1 (None sans vecteur)"""
+        doc = self._nlp_cache(texte)
+        if not doc.has_vector or not doc.vector_norm:
+            return None
+        return doc.vector / doc.vector_norm
+    
+    def calculer_similarite(self, texte1, texte2, vecteur2=None):
+        """
+        Calcule la similarité entre deux textes (0 à 1)
+        vecteur2 : vecteur normalisé de texte2 déjà calculé (optionnel)
+        """
         if self.nlp:
-            doc1 = self.nlp(texte1)
-            doc2 = self.nlp(texte2)
+            doc1 = self._nlp_cache(texte1)
+            if vecteur2 is not None and doc1.has_vector and doc1.vector_norm:
+                # Chemin rapide : seul texte1 est analysé, cosinus direct
+                return float(doc1.vector @ vecteur2) / doc1.vector_norm
+            doc2 = self._nlp_cache(texte2)
             # Gérer les vecteurs vides
             if not doc1.has_vector or not doc2.has_vector:
-                return SequenceMatcher(None, texte1, texte2).ratio()
+                return _ratio(texte1, texte2)
             return doc1.similarity(doc2)
         else:
             texte1_norm = self.normaliser_texte(texte1)
             texte2_norm = self.normaliser_texte(texte2)
-            return SequenceMatcher(None, texte1_norm, texte2_norm).ratio()
+            return _ratio(texte1_norm, texte2_norm)
     
-    def verifier_presence_elements(self, reponse_user, elements_requis):
-        """Vérifie la présence des éléments obligatoires"""
-        reponse_norm = self.normaliser_texte(reponse_user)
+    def verifier_presence_elements(self, reponse_user, elements_requis, reponse_norm=None):
+        """
+        Vérifie la présence des éléments obligatoires
+        reponse_norm : réponse déjà normalisée (évite de la recalculer)
+        """
+        if reponse_norm is None:
+            reponse_norm = self.normaliser_texte(reponse_user)
         mots_cles_reponse = self.extraire_mots_cles(reponse_user)
         
         resultats = {
@@ -205,8 +356,8 @@ class ReponseAnalyzer:
         }
         
         for element in elements_requis:
-            element_norm = self.normaliser_texte(element)
-            mots_cles_element = self.extraire_mots_cles(element)
+            element_norm = self._normaliser_point(element)
+            mots_cles_element = self._mots_cles_point(element)
             
             if element_norm in reponse_norm:
                 resultats['presents'].append(element)
@@ -217,13 +368,14 @@ class ReponseAnalyzer:
         
         return resultats
     
-    def detecter_erreurs(self, reponse_user, erreurs_a_eviter):
+    def detecter_erreurs(self, reponse_user, erreurs_a_eviter, reponse_norm=None):
         """Détecte les erreurs présentes dans la réponse"""
-        reponse_norm = self.normaliser_texte(reponse_user)
+        if reponse_norm is None:
+            reponse_norm = self.normaliser_texte(reponse_user)
         erreurs_detectees = []
         
         for erreur in erreurs_a_eviter:
-            erreur_norm = self.normaliser_texte(erreur)
+            erreur_norm = self._normaliser_point(erreur)
             if erreur_norm in reponse_norm:
                 erreurs_detectees.append(erreur)
         
@@ -235,19 +387,73 @@ class ReponseAnalyzer:
         Évalue la réponse en utilisant Gemini si possible,
         sinon utilise l'analyseur local.
         Retourne (resultats, prompt_utilise)
+        Une réponse identique à la même version d'une question n'est
+        évaluée qu'une fois (cache LRU).
         """
+        cle = self._cle_cache(question_data, reponse_user)
+        resultat = self._lire_cache(cle)
+        if resultat is not None:
+            return resultat
+        
         if self.gemini_model:
             try:
                 print("Tentative d'évaluation avec Gemini...")
-                return self.evaluer_reponse_gemini(question_data, reponse_user)
+                resultat = self.evaluer_reponse_gemini(question_data, reponse_user)
             except Exception as e:
+                # Pas de mise en cache : Gemini sera retenté la prochaine fois
                 print(f"Erreur évaluation Gemini: {e}. Bascule en mode local.")
                 resultats = self.evaluer_reponse_local(question_data, reponse_user)
                 return resultats, f"Erreur Gemini ({e}) - Mode local utilisé."
         else:
             print("Évaluation en mode local (Gemini non configuré).")
             resultats = self.evaluer_reponse_local(question_data, reponse_user)
-            return resultats, "Mode local (Gemini non configuré)."
+            resultat = resultats, "Mode local (Gemini non configuré)."
+        
+        self._ecrire_cache(cle, resultat)
+        return resultat
+
+    async def evaluer_reponse_async(self, question_data, reponse_user):
+        """Équivalent asynchrone de evaluer_reponse (même retour, même cache)"""
+        cle = self._cle_cache(question_data, reponse_user)
+        resultat = self._lire_cache(cle)
+        if resultat is not None:
+            return resultat
+        
+        if self.gemini_model:
+            try:
+                resultat = await self.evaluer_reponse_gemini_async(question_data, reponse_user)
+            except Exception as e:
+                print(f"Erreur évaluation Gemini: {e}. Bascule en mode local.")
+                resultats = self.evaluer_reponse_local(question_data, reponse_user)
+                return resultats, f"Erreur Gemini ({e}) - Mode local utilisé."
+        else:
+            resultats = self.evaluer_reponse_local(question_data, reponse_user)
+            resultat = resultats, "Mode local (Gemini non configuré)."
+        
+        self._ecrire_cache(cle, resultat)
+        return resultat
+
+    # --- CACHE DES RÉSULTATS (question, version, réponse) ---
+    @staticmethod
+    def _cle_cache(question_data, reponse_user):
+        return (
+            question_data.get('numero'),
+            question_data.get('version', 0),
+            hashlib.blake2b(reponse_user.encode(), digest_size=16).digest(),
+        )
+
+    def _lire_cache(self, cle):
+        with self._cache_lock:
+            if cle in self._cache_resultats:
+                self._cache_resultats.move_to_end(cle)
+                return self._cache_resultats[cle]
+        return None
+
+    def _ecrire_cache(self, cle, resultat):
+        with self._cache_lock:
+            self._cache_resultats[cle] = resultat
+            if len(self._cache_resultats) > self.TAILLE_CACHE_RESULTATS:
+                self._cache_resultats.popitem(last=False)
 
     # --- NOUVELLE MÉTHODE : ÉVALUATION PAR GEMINI ---
     def _construire_prompt_gemini(self, question_data, reponse_user):
@@ -299,20 +505,117 @@ class ReponseAnalyzer:
             prompt,
             generation_config=generation_config
         )
+        return self._parser_reponse_gemini(response, prompt)
+
+    async def evaluer_reponse_gemini_async(self, question_data, reponse_user):
+        """
+        Variante asynchrone de evaluer_reponse_gemini : l'appel réseau
+        n'occupe pas le thread, plusieurs évaluations peuvent se chevaucher
+        """
+        
+        prompt = self._construire_prompt_gemini(question_data, reponse_user)
+        
+        generation_config = genai.types.GenerationConfig(
+            response_mime_type="application/json"
+        )
+        
+        response = await self.gemini_model.generate_content_async(
+            prompt,
+            generation_config=generation_config
+        )
+        return self._parser_reponse_gemini(response, prompt)
+
+    def _completer_resultats_gemini(self, resultats):
+        """S'assure que les clés minimales existent dans un résultat Gemini"""
+        resultats.setdefault('est_correct', resultats.get('score', 0) >= 60)
+        resultats.setdefault('similarite', 0) # Gemini ne donne pas ce score
+        resultats.setdefault('elements_presents', [])
+        resultats.setdefault('elements_partiels', [])
+        resultats.setdefault('elements_absents', [])
+        resultats.setdefault('erreurs_detectees', [])
+        resultats.setdefault('suggestions', ["Analyse effectuée par Gemini."])
+        resultats.setdefault('score', 0)
+        return resultats
+
+    # --- ÉVALUATION GROUPÉE (une classe entière en un seul appel) ---
+    def _construire_prompt_gemini_batch(self, question_data, reponses):
+        """Construit un prompt unique : la question une fois, puis les réponses numérotées"""
+        
+        reponses_numerotees = '\n'.join(
+            f'{i}. "{reponse}"' for i, reponse in enumerate(reponses, start=1)
+        )
+        
+        prompt = f"""
+        Tu es un assistant d'évaluation pédagogique. Ton rôle est d'évaluer les réponses de plusieurs étudiants à une même question, en te basant sur des critères stricts.
+
+        Voici la question :
+        Titre : {question_data.get('titre', 'N/A')}
+        Énoncé : {question_data.get('enonce', 'N/A')}
+
+        Voici les critères d'évaluation :
+        1.  Réponse attendue (modèle) : {question_data.get('reponse_attendue', 'N/A')}
+        2.  Points obligatoires (doivent être présents) : {', '.join(question_data.get('points_obligatoires', [])) or 'N/A'}
+        3.  Erreurs à éviter (ne doivent pas être présents) : {', '.join(question_data.get('erreurs_a_eviter', [])) or 'N/A'}
+
+        Voici les {len(reponses)} réponses des étudiants, numérotées :
+        {reponses_numerotees}
+
+        TA TÂCHE :
+        Évalue chaque réponse indépendamment en fonction des critères.
+        Fournis une analyse structurée au format JSON EXACT : {{"results": [...]}}
+        où "results" contient exactement {len(reponses)} objets, dans l'ordre des réponses.
+        Chaque objet doit contenir les clés suivantes :
+        -   "score": Un score numérique de 0 à 100.
+        -   "est_correct": Un booléen (true/false) indiquant si la réponse est globalement satisfaisante (score >= 60 et pas d'erreurs majeures).
+        -   "elements_presents": Une liste de strings des points obligatoires que tu as trouvés dans la réponse.
+        -   "elements_partiels": Une liste de strings des points obligatoires qui sont mentionnés mais pas assez développés.
+        -   "elements_absents": Une liste de strings des points obligatoires qui manquent.
+        -   "erreurs_detectees": Une liste de strings des "erreurs à éviter" que tu as trouvées.
+        -   "suggestions": Une liste de strings donnant 1 ou 2 conseils clés à l'étudiant pour s'améliorer, basés sur les éléments absents ou les erreurs.
+        
+        Ne renvoie QUE le JSON, sans aucun autre texte avant ou après.
+        """
+        return ' '.join(prompt.split())
+
+    def evaluer_reponses_batch_gemini(self, question_data, reponses):
+        """
+        Évalue plusieurs réponses à la même question en un seul appel Gemini.
+        Retourne (liste_resultats, prompt_utilise), dans l'ordre des réponses.
+        Si Gemini ne renvoie pas un résultat par réponse, chaque réponse est
+        évaluée en mode local.
+        """
+        if not reponses:
+            return [], ""
+        if not self.gemini_model:
+            resultats = [self.evaluer_reponse_local(question_data, r) for r in reponses]
+            return resultats, "Mode local (Gemini non configuré)."
+        
+        prompt = self._construire_prompt_gemini_batch(question_data, reponses)
         
+        try:
+            generation_config = genai.types.GenerationConfig(
+                response_mime_type="application/json"
+            )
+            response = self.gemini_model.generate_content(
+                prompt,
+                generation_config=generation_config
+            )
+            results = _json_loads(response.text)['results']
+            if not isinstance(results, list) or len(results) != len(reponses):
+                raise ValueError(f"{len(reponses)} résultats attendus")
+            return [self._completer_resultats_gemini(r) for r in results], prompt
+        
+        except Exception as e:
+            # réseau, quota, API ou JSON inutilisable : même repli que evaluer_reponse
+            print(f"Erreur évaluation Gemini groupée: {e}. Bascule en mode local.")
+            resultats = [self.evaluer_reponse_local(question_data, r) for r in reponses]
+            return resultats, f"Erreur Gemini ({e}) - Mode local utilisé."
+
+    def _parser_reponse_gemini(self, response, prompt):
+        """Convertit la réponse JSON de Gemini en dictionnaire de résultats"""
         try:
             resultats_json_str = response.text
-            resultats = json.loads(resultats_json_str)
-            
-            # S'assurer que les clés minimales existent
-            resultats.setdefault('est_correct', resultats.get('score', 0) >= 60)
-            resultats.setdefault('similarite', 0) # Gemini ne donne pas ce score
-            resultats.setdefault('elements_presents', [])
-            resultats.setdefault('elements_partiels', [])
-            resultats.setdefault('elements_absents', [])
-            resultats.setdefault('erreurs_detectees', [])
-            resultats.setdefault('suggestions', ["Analyse effectuée par Gemini."])
-            resultats.setdefault('score', 0)
+            resultats = self._completer_resultats_gemini(_json_loads(resultats_json_str))
             
             print("Analyse Gemini réussie.")
             return resultats, prompt
@@ -333,14 +636,26 @@ class ReponseAnalyzer:
         points_obligatoires = question_data.get('points_obligatoires', [])
         erreurs_a_eviter = question_data.get('erreurs_a_eviter', [])
         
+        # Vecteur de la réponse attendue : calculé une fois, conservé avec la question
+        vecteur_attendu = None
+        if self.nlp and reponse_attendue:
+            cache = question_data.get('_vecteur_attendu')
+            if not cache or cache[0] != reponse_attendue:
+                cache = (reponse_attendue, self.vecteur_normalise(reponse_attendue))
+                question_data['_vecteur_attendu'] = cache
+            vecteur_attendu = cache[1]
+        
         # Calcul de la similarité globale
-        similarite = self.calculer_similarite(reponse_user, reponse_attendue)
+        similarite = self.calculer_similarite(reponse_user, reponse_attendue, vecteur_attendu)
         
         # Vérification des éléments obligatoires
-        verification_elements = self.verifier_presence_elements(reponse_user, points_obligatoires)
+        reponse_norm = self.normaliser_texte(reponse_user)
+        verification_elements = self.verifier_presence_elements(
+            reponse_user, points_obligatoires, reponse_norm
+        )
         
         # Détection des erreurs
-        erreurs_trouvees = self.detecter_erreurs(reponse_user, erreurs_a_eviter)
+        erreurs_trouvees = self.detecter_erreurs(reponse_user, erreurs_a_eviter, reponse_norm)
         
         # Calcul du score final
         score_base = similarite * 100
@@ -387,6 +702,22 @@ class ReponseAnalyzer:
         
         return suggestions
 
+
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+def get_analyzer():
+    """
+    Retourne l'analyseur partagé, créé au premier appel
+    (le chargement de spaCy et de Gemini n'a lieu qu'une fois par processus)
+    """
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                _analyzer = ReponseAnalyzer()
+    return _analyzer
+
 # ============================================================================
 # PARTIE 1 : INTERFACE DE CRÉATION DE QUESTIONS
 # ============================================================================
@@ -394,14 +725,29 @@ class ReponseAnalyzer:
 class CreationQuestionGUI:
     """Interface graphique pour créer de nouvelles questions"""
     
-    def __init__(self, root):
+    # Types proposés par le dialogue d'ajout de fichier
+    _FILETYPES = (
+        ("Images", "*.png *.jpg *.jpeg *.gif *.bmp"),
+        ("Vidéos", "*.mp4 *.avi *.mov *.mkv"),
+        ("Audio", "*.mp3 *.wav *.ogg"),
+        ("Tous les fichiers", "*.*")
+    )
+    
+    # Champs obligatoires : (clé, lecture du champ, message d'erreur si vide)
+    _REQUIRED = (
+        ('titre', lambda s: s.titre_entry.get().strip(), "Le titre est obligatoire!"),
+        ('enonce', lambda s: s._read_text(s.enonce_text, 'enonce').strip(), "L'énoncé est obligatoire!"),
+    )
+    
+    def __init__(self, root, manager=None):
         self.root = root
         self.root.title("📝 Création de Questions")
         self.root.geometry("900x800")
         self.root.configure(bg=Config.COLOR_BG)
         
-        self.manager = QuestionManager()
-        self.fichiers_attaches = []
+        self.manager = manager or QuestionManager()
+        self.fichiers_attaches = {}  # chemins sans doublon, dans l'ordre d'ajout
+        self._text_cache = {}  # dernier contenu lu de chaque zone de texte (voir _read_text)
         
         self._create_widgets()
     
@@ -422,24 +768,13 @@ class CreationQuestionGUI:
         )
         title_label.pack(pady=20)
         
-        # Zone de défilement principale
-        main_canvas = tk.Canvas(self.root, bg=Config.COLOR_BG)
-        scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=main_canvas.yview)
-        scrollable_frame = tk.Frame(main_canvas, bg=Config.COLOR_BG)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: main_canvas.configure(scrollregion=main_canvas.bbox("all"))
-        )
-        
-        main_canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        main_canvas.configure(yscrollcommand=scrollbar.set)
-        
-        main_canvas.pack(side="left", fill="both", expand=True, padx=10, pady=10)
-        scrollbar.pack(side="right", fill="y")
+        # Zone principale : le formulaire a un nombre fixe de champs et tient
+        # dans la fenêtre, il est donc placé directement (sans Canvas défilant)
+        content_frame = tk.Frame(self.root, bg=Config.COLOR_BG)
+        content_frame.pack(fill='both', expand=True, padx=10, pady=10)
         
         # Formulaire
-        form_frame = tk.Frame(scrollable_frame, bg=Config.COLOR_BG)
+        form_frame = tk.Frame(content_frame, bg=Config.COLOR_BG)
         form_frame.pack(fill='both', expand=True, padx=20, pady=10)
         
         # Numéro de question (auto)
@@ -507,7 +842,7 @@ class CreationQuestionGUI:
         self.erreurs_text.grid(row=6, column=1, pady=(25, 10), sticky='w')
         
         # Boutons d'action
-        buttons_frame = tk.Frame(scrollable_frame, bg=Config.COLOR_BG)
+        buttons_frame = tk.Frame(content_frame, bg=Config.COLOR_BG)
         buttons_frame.pack(pady=20)
         
         btn_save = tk.Button(
@@ -544,52 +879,48 @@ class CreationQuestionGUI:
     
     def ajouter_fichier(self):
         """Ouvre un dialogue pour sélectionner un fichier"""
-        filetypes = [
-            ("Images", "*.png *.jpg *.jpeg *.gif *.bmp"),
-            ("Vidéos", "*.mp4 *.avi *.mov *.mkv"),
-            ("Audio", "*.mp3 *.wav *.ogg"),
-            ("Tous les fichiers", "*.*")
-        ]
-        
         fichier = filedialog.askopenfilename(
             title="Sélectionner un fichier",
-            filetypes=filetypes
+            filetypes=self._FILETYPES
         )
         
         if fichier:
-            self.fichiers_attaches.append(fichier)
+            self.fichiers_attaches[fichier] = None
             self.files_label.config(
                 text=f"{len(self.fichiers_attaches)} fichier(s) ajouté(s)",
                 fg=Config.COLOR_SUCCESS
             )
     
+    def _read_text(self, widget, key):
+        """
+        Contenu d'une zone de texte, relu depuis Tk seulement si elle a été
+        modifiée depuis la dernière lecture (drapeau edit_modified)
+        """
+        if key not in self._text_cache or widget.edit_modified():
+            self._text_cache[key] = widget.get("1.0", 'end-1c')
+            widget.edit_modified(False)
+        return self._text_cache[key]
+    
     def sauvegarder_question(self):
         """Sauvegarde la question avec toutes ses données"""
         # Validation
-        if not self.titre_entry.get().strip():
-            messagebox.showerror("Erreur", "Le titre est obligatoire!")
-            return
-        
-        if not self.enonce_text.get("1.0", 'end').strip():
-            messagebox.showerror("Erreur", "L'énoncé est obligatoire!")
-            return
+        valeurs = {}
+        for cle, lire, erreur in self._REQUIRED:
+            valeurs[cle] = lire(self)
+            if not valeurs[cle]:
+                messagebox.showerror("Erreur", erreur)
+                return
         
         # Construction des données
         question_data = {
             'numero': int(self.numero_var.get()),
-            'titre': self.titre_entry.get().strip(),
-            'enonce': self.enonce_text.get("1.0", 'end').strip(),
-            'fichiers': self.fichiers_attaches.copy(),
-            'reponse_attendue': self.reponse_text.get("1.0", 'end').strip(),
-            'points_obligatoires': [
-                line.strip() for line in self.points_text.get("1.0", 'end').split('\n') 
-                if line.strip()
-            ],
-            'erreurs_a_eviter': [
-                line.strip() for line in self.erreurs_text.get("1.0", 'end').split('\n') 
-                if line.strip()
-            ],
-            'date_creation': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            **valeurs,
+            'fichiers': list(self.fichiers_attaches),
+            'reponse_attendue': self._read_text(self.reponse_text, 'reponse').strip(),
+            'points_obligatoires': _NONEMPTY_LINE.findall(self._read_text(self.points_text, 'points')),
+            'erreurs_a_eviter': _NONEMPTY_LINE.findall(self._read_text(self.erreurs_text, 'erreurs')),
+            'date_creation': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),  # affichage
+            'date_creation_ns': time.time_ns()  # tri / comparaison
         }
         
         # Sauvegarde
@@ -619,18 +950,42 @@ class CreationQuestionGUI:
 class EvaluationQuestionGUI:
     """Interface pour lister les questions et évaluer les réponses"""
     
-    def __init__(self, root):
+    def __init__(self, root, manager=None):
         self.root = root
         self.root.title("📊 Évaluation de Questions")
         self.root.geometry("1000x800") # Augmenté la hauteur
         self.root.configure(bg=Config.COLOR_BG)
         
-        self.manager = QuestionManager()
-        self.analyzer = ReponseAnalyzer()
+        self.manager = manager or QuestionManager()
         self.question_selectionnee = None
         
+        # L'analyse (spaCy / Gemini) tourne hors de la boucle Tk ; l'analyseur
+        # se charge en parallèle de l'ouverture de la fenêtre
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        self._analyzer_future = self._executor.submit(get_analyzer)
+        self._configure_after = None  # mise à jour différée de la zone de défilement
+        self._largeur_resultats = self._LARGEUR_RESULTATS  # recalculée au redimensionnement
+        self._resultats_affiches = None  # (resultats, prompt) affichés, pour réagencer
+        self.root.bind('<Destroy>', self._on_destroy, add='+')
+        
         self._create_widgets()
         self.charger_questions()
+        # Recharger la liste dès qu'une question est sauvegardée
+        self.manager.on_modified.append(self.charger_questions)
+    
+    @property
+    def analyzer(self):
+        """Analyseur partagé (attend la fin de son chargement si nécessaire)"""
+        return self._analyzer_future.result()
+    
+    def _on_destroy(self, event):
+        """Libère le pool de threads et l'écouteur à la fermeture de la fenêtre"""
+        if event.widget is self.root:
+            self._executor.shutdown(wait=False)
+            if self._configure_after:
+                self.root.after_cancel(self._configure_after)
+            if self.charger_questions in self.manager.on_modified:
+                self.manager.on_modified.remove(self.charger_questions)
     
     def _create_widgets(self):
         """Crée l'interface d'évaluation"""
@@ -666,22 +1021,29 @@ class EvaluationQuestionGUI:
         list_frame = tk.Frame(left_panel, bg='white')
         list_frame.pack(fill='both', expand=True, padx=10, pady=(0, 10))
         
-        scrollbar = ttk.Scrollbar(list_frame)
-        scrollbar.pack(side='right', fill='y')
+        # La liste est virtualisée : seules les lignes visibles existent dans
+        # la Listbox, la scrollbar est pilotée à la main (voir _afficher_fenetre)
+        self.list_scrollbar = ttk.Scrollbar(list_frame, command=self._on_list_scroll)
+        self.list_scrollbar.pack(side='right', fill='y')
         
         self.questions_listbox = tk.Listbox(
             list_frame,
             font=('Arial', 10),
-            yscrollcommand=scrollbar.set,
             selectmode='single',
             bg='white',
             selectbackground=Config.COLOR_SECONDARY,
             selectforeground='white'
         )
         self.questions_listbox.pack(side='left', fill='both', expand=True)
-        scrollbar.config(command=self.questions_listbox.yview)
+        # estimation jusqu'à la mesure réelle (bbox) des premières lignes affichées
+        self._hauteur_ligne = tkfont.Font(font=self.questions_listbox['font']).metrics('linespace') + 1
+        self._hauteur_mesuree = False
         
         self.questions_listbox.bind('<<ListboxSelect>>', self.on_question_select)
+        self.questions_listbox.bind('<Configure>', lambda e: self._afficher_fenetre())
+        self.questions_listbox.bind('<MouseWheel>', self._on_list_wheel)
+        self.questions_listbox.bind('<Button-4>', lambda e: self._defiler_liste(-3))
+        self.questions_listbox.bind('<Button-5>', lambda e: self._defiler_liste(3))
         
         btn_refresh = tk.Button(
             left_panel,
@@ -695,14 +1057,11 @@ class EvaluationQuestionGUI:
         btn_refresh.pack(pady=10)
         
         # Panneau droit : Détails et réponse (avec défilement)
-        right_canvas = tk.Canvas(main_container, bg='white', highlightthickness=0)
+        self.right_canvas = right_canvas = tk.Canvas(main_container, bg='white', highlightthickness=0)
         right_scrollbar = ttk.Scrollbar(main_container, orient="vertical", command=right_canvas.yview)
         right_panel = tk.Frame(right_canvas, bg='white') # Le 'panel' devient 'frame'
         
-        right_panel.bind(
-            "<Configure>",
-            lambda e: right_canvas.configure(scrollregion=right_canvas.bbox("all"))
-        )
+        right_panel.bind("<Configure>", self._on_right_configure)
 
         right_canvas.create_window((0, 0), window=right_panel, anchor="nw")
         right_canvas.configure(yscrollcommand=right_scrollbar.set)
@@ -768,22 +1127,183 @@ class EvaluationQuestionGUI:
         )
         self.btn_evaluer.pack(pady=10)
         
-        # Zone de résultats
-        self.resultats_frame = tk.Frame(details_frame, bg='white')
-        self.resultats_frame.pack(fill='both', expand=True, pady=10)
+        # Zone de résultats : un Canvas unique dont les éléments sont créés
+        # une fois puis reconfigurés à chaque évaluation (voir afficher_resultats)
+        self.resultats_canvas = tk.Canvas(details_frame, bg='white', highlightthickness=0, height=1)
+        self.resultats_canvas.pack(fill='both', expand=True, pady=10)
+        self._creer_elements_resultats()
+    
+    # Sections de résultats : (clé, titre, champ des résultats, couleur)
+    _SECTIONS = (
+        ('presents', "✅ Points bien mentionnés:", 'elements_presents', Config.COLOR_SUCCESS),
+        ('partiels', "⚠️ Points partiellement abordés:", 'elements_partiels', 'orange'),
+        ('absents', "❌ Points manquants:", 'elements_absents', Config.COLOR_WARNING),
+        ('erreurs', "🚫 Erreurs à corriger:", 'erreurs_detectees', Config.COLOR_WARNING),
+    )
+    _LARGEUR_RESULTATS = 560  # largeur initiale, avant la première mesure du Canvas
+    
+    def _creer_elements_resultats(self):
+        """Crée (masqués) les éléments persistants de la zone de résultats"""
+        c = self.resultats_canvas
+        opts = {'state': 'hidden', 'tags': ('resultats',)}
+        
+        self._item_statut = c.create_text(0, 0, anchor='n', font=('Arial', 14, 'bold'), **opts)
+        self._item_score = c.create_text(0, 0, anchor='n', font=('Arial', 11), **opts)
+        self._items_separateurs = [c.create_line(0, 0, 0, 0, fill='#c8c8c8', **opts) for _ in range(3)]
+        
+        self._items_titres = {
+            cle: c.create_text(0, 0, anchor='nw', font=('Arial', 10, 'bold'), **opts)
+            for cle, *_ in self._SECTIONS
+        }
+        self._items_titres['suggestions'] = c.create_text(
+            0, 0, anchor='nw', font=('Arial', 11, 'bold'), fill=Config.COLOR_PRIMARY,
+            text="💡 Suggestions d'amélioration:", **opts
+        )
+        # Un seul élément texte multi-lignes par section pour toutes ses puces
+        self._items_puces = {
+            cle: c.create_text(0, 0, anchor='nw', font=('Arial', 9),
+                               width=self._LARGEUR_RESULTATS - 10, **opts)
+            for cle in self._items_titres
+        }
+        
+        self._item_prompt_titre = c.create_text(
+            0, 0, anchor='nw', font=('Arial', 11, 'bold'), fill=Config.COLOR_PRIMARY,
+            text="🤖 Contexte de l'évaluation IA :", **opts
+        )
+        self.prompt_display = scrolledtext.ScrolledText(
+            c,
+            height=6,
+            wrap='word',
+            font=('Courier', 9, 'italic'),
+            bg='#f8f9fa',
+            fg='#555',
+            state='disabled'
+        )
+        # le Text vit dans son propre .frame (enfant du canvas) : c'est lui qu'on place
+        self._item_prompt = c.create_window(0, 0, anchor='nw', window=self.prompt_display.frame, **opts)
+    
+    def _on_right_configure(self, event):
+        """Regroupe les <Configure> d'un redimensionnement en une seule mise à jour"""
+        if self._configure_after:
+            self.root.after_cancel(self._configure_after)
+        self._configure_after = self.root.after(80, self._maj_scrollregion)
+    
+    def _maj_scrollregion(self):
+        """Recalcule la zone de défilement du panneau droit"""
+        self._configure_after = None
+        
+        # Largeur de retour à la ligne mesurée une fois ici, puis réutilisée
+        largeur = self.resultats_canvas.winfo_width()
+        if largeur > 1 and largeur != self._largeur_resultats:
+            self._largeur_resultats = largeur
+            for item in self._items_puces.values():
+                self.resultats_canvas.itemconfigure(item, width=largeur - 10)
+            if self._resultats_affiches:
+                self.afficher_resultats(*self._resultats_affiches)
+        
+        self.right_canvas.configure(scrollregion=self.right_canvas.bbox("all"))
+    
+    def _masquer_resultats(self):
+        """Cache la zone de résultats sans détruire ses éléments"""
+        self.resultats_canvas.itemconfigure('resultats', state='hidden')
+        self._resultats_affiches = None
+        self.resultats_canvas.configure(height=1)
+    
+    def _placer(self, item, x, y, **options):
+        """Affiche un élément du Canvas en (x, y) et retourne son bord inférieur"""
+        c = self.resultats_canvas
+        c.itemconfigure(item, state='normal', **options)
+        c.coords(item, x, y)
+        return c.bbox(item)[3]
+    
+    def _placer_separateur(self, index, y):
+        """Affiche le séparateur horizontal n° index à la hauteur y"""
+        item = self._items_separateurs[index]
+        self.resultats_canvas.itemconfigure(item, state='normal')
+        self.resultats_canvas.coords(item, 0, y, self._largeur_resultats, y)
+        return y
     
     def charger_questions(self):
         """Charge et affiche toutes les questions disponibles"""
+        # Une seule requête (numero, titre) ; les textes sont formatés à l'affichage
+        titres = self.manager.load_titles()
+        self._question_nums = [num for num, _ in titres]
+        self._titres = dict(titres)
+        self._textes_affiches = {}  # numero -> texte affiché (invalidé à l'actualisation)
+        self._decalage = 0
+        self._afficher_fenetre()
+    
+    def _lignes_visibles(self):
+        """Nombre de lignes entières que la Listbox peut afficher"""
+        lb = self.questions_listbox
+        bords = 2 * (int(lb['borderwidth']) + int(lb['highlightthickness']))
+        return max(1, (lb.winfo_height() - bords) // self._hauteur_ligne)
+    
+    def _mesurer_ligne(self):
+        """Hauteur réelle d'une ligne, lue sur les lignes affichées ; True si elle a changé"""
+        lb = self.questions_listbox
+        premiere, seconde = lb.bbox(0), lb.bbox(1)
+        if not premiere:
+            return False  # pas encore affichée : nouvel essai au prochain remplissage
+        # écart entre deux lignes (marges de sélection comprises), sinon hauteur de la ligne
+        hauteur = seconde[1] - premiere[1] if seconde else premiere[3]
+        self._hauteur_mesuree = bool(seconde)
+        if hauteur <= 0 or hauteur == self._hauteur_ligne:
+            return False
+        self._hauteur_ligne = hauteur
+        return True
+    
+    def _afficher_fenetre(self):
+        """Remplit la Listbox avec la seule fenêtre de questions visible"""
+        if not hasattr(self, '_question_nums'):
+            return
+        total = len(self._question_nums)
         self.questions_listbox.delete(0, 'end')
-        questions = self.manager.load_all_questions()
+        self._listbox_nums = []  # index de ligne -> numero de question
         
-        if not questions:
+        if not total:
             self.questions_listbox.insert('end', "Aucune question disponible")
+            self.list_scrollbar.set(0, 1)
+            return
+        
+        lignes = self._lignes_visibles()
+        self._decalage = max(0, min(self._decalage, total - lignes))
+        nums = self._listbox_nums = self._question_nums[self._decalage:self._decalage + lignes]
+        
+        for num in nums:
+            if num not in self._textes_affiches:
+                self._textes_affiches[num] = f"Q{num} - {self._titres[num][:50]}"
+        
+        self.questions_listbox.insert('end', *(self._textes_affiches[num] for num in nums))
+        if not self._hauteur_mesuree and self._mesurer_ligne():
+            self._afficher_fenetre()  # nombre de lignes recalculé avec la vraie hauteur
             return
+        self.list_scrollbar.set(self._decalage / total, (self._decalage + len(nums)) / total)
         
-        for q in questions:
-            display_text = f"Q{q['numero']} - {q['titre'][:50]}"
-            self.questions_listbox.insert('end', display_text)
+        # Conserver la surbrillance de la question sélectionnée
+        if self.question_selectionnee and self.question_selectionnee['numero'] in nums:
+            self.questions_listbox.selection_set(nums.index(self.question_selectionnee['numero']))
+    
+    def _defiler_liste(self, delta):
+        """Décale la fenêtre affichée de `delta` lignes"""
+        self._decalage += delta
+        self._afficher_fenetre()
+        return 'break'
+    
+    def _on_list_wheel(self, event):
+        """Molette (Windows / macOS)"""
+        return self._defiler_liste(-3 if event.delta > 0 else 3)
+    
+    def _on_list_scroll(self, action, valeur, unite=None):
+        """Commande de la scrollbar ('moveto' fraction ou 'scroll' n unités/pages)"""
+        if not getattr(self, '_question_nums', None):
+            return
+        if action == 'moveto':
+            self._decalage = int(float(valeur) * len(self._question_nums))
+        else:
+            pas = self._lignes_visibles() if unite == 'pages' else 1
+            self._decalage += int(valeur) * pas
+        self._afficher_fenetre()
     
     def on_question_select(self, event):
         """Gère la sélection d'une question"""
@@ -791,16 +1311,14 @@ class EvaluationQuestionGUI:
         if not selection:
             return
         
-        # Nettoyer les résultats précédents
-        for widget in self.resultats_frame.winfo_children():
-            widget.destroy()
+        # Masquer les résultats précédents
+        self._masquer_resultats()
         
-        selected_text = self.questions_listbox.get(selection[0])
-        if "Aucune question" in selected_text:
+        if selection[0] >= len(self._listbox_nums):  # ligne "Aucune question disponible"
             return
         
         try:
-            question_num = int(selected_text.split('-')[0].replace('Q', '').strip())
+            question_num = self._listbox_nums[selection[0]]
             self.question_selectionnee = self.manager.load_question(question_num)
             
             if self.question_selectionnee:
@@ -831,150 +1349,81 @@ class EvaluationQuestionGUI:
             messagebox.showwarning("Attention", "Veuillez saisir une réponse")
             return
         
-        # --- MODIFICATION ---
-        try:
-            # L'analyseur retourne maintenant (resultats, prompt)
-            self.btn_evaluer.config(text="Évaluation en cours...", state="disabled")
-            self.root.update_idletasks() # Forcer la mise à jour de l'UI
-            
-            resultats, prompt_utilise = self.analyzer.evaluer_reponse(
-                self.question_selectionnee, reponse_user
-            )
-            
-            # Afficher les résultats
-            self.afficher_resultats(resultats, prompt_utilise) # Passer le prompt
+        # L'évaluation part dans un thread ; la fenêtre reste réactive
+        self.btn_evaluer.config(text="Évaluation en cours...", state="disabled")
+        # (l'attente éventuelle du chargement de l'analyseur se fait dans le thread)
+        future = self._executor.submit(
+            lambda question, reponse: self.analyzer.evaluer_reponse(question, reponse),
+            self.question_selectionnee, reponse_user
+        )
+        self.root.after(50, self._poll_result, future, self.question_selectionnee)
+    
+    def _poll_result(self, future, question):
+        """Vérifie depuis la boucle Tk si l'évaluation en cours est terminée"""
+        if not self.root.winfo_exists():
+            return
+        if not future.done():
+            self.root.after(50, self._poll_result, future, question)
+            return
         
+        try:
+            # L'analyseur retourne (resultats, prompt)
+            resultats, prompt_utilise = future.result()
+            # Ignorer le résultat si une autre question a été sélectionnée entre-temps
+            if question is self.question_selectionnee:
+                self.afficher_resultats(resultats, prompt_utilise)
         except Exception as e:
             messagebox.showerror("Erreur d'analyse", f"Une erreur est survenue lors de l'évaluation : {e}")
         finally:
             self.btn_evaluer.config(text="🔍 Évaluer ma réponse", state="normal")
-        # --- FIN MODIFICATION ---
     
     def afficher_resultats(self, resultats, prompt_utilise):
         """Affiche les résultats de l'évaluation + le prompt"""
-        # Nettoyer
-        for widget in self.resultats_frame.winfo_children():
-            widget.destroy()
+        self._masquer_resultats()
+        self._resultats_affiches = (resultats, prompt_utilise)
+        centre = self._largeur_resultats // 2
         
         # Titre des résultats
         color = Config.COLOR_SUCCESS if resultats['est_correct'] else Config.COLOR_WARNING
         status_text = "✅ RÉPONSE CORRECTE" if resultats['est_correct'] else "⚠️ À AMÉLIORER"
-        
-        status_label = tk.Label(
-            self.resultats_frame,
-            text=status_text,
-            font=('Arial', 14, 'bold'),
-            bg='white',
-            fg=color
-        )
-        status_label.pack(pady=10)
+        y = self._placer(self._item_statut, centre, 10, text=status_text, fill=color) + 10
         
         # Score
         score_text = f"Score : {resultats['score']}/100"
         if resultats['similarite'] > 0: # N'afficher que si pertinent (mode local)
             score_text += f" | Similarité : {resultats['similarite']}%"
-
-        score_label = tk.Label(
-            self.resultats_frame,
-            text=score_text,
-            font=('Arial', 11),
-            bg='white'
-        )
-        score_label.pack()
+        y = self._placer(self._item_score, centre, y, text=score_text)
         
         # Séparateur
-        ttk.Separator(self.resultats_frame, orient='horizontal').pack(fill='x', pady=10)
-        
-        # Points présents
-        if resultats['elements_presents']:
-            self._afficher_section("✅ Points bien mentionnés:", 
-                                  resultats['elements_presents'], 
-                                  Config.COLOR_SUCCESS)
-        
-        # Points partiels
-        if resultats['elements_partiels']:
-            self._afficher_section("⚠️ Points partiellement abordés:", 
-                                  resultats['elements_partiels'], 
-                                  'orange')
-        
-        # Points manquants
-        if resultats['elements_absents']:
-            self._afficher_section("❌ Points manquants:", 
-                                  resultats['elements_absents'], 
-                                  Config.COLOR_WARNING)
-        
-        # Erreurs détectées
-        if resultats['erreurs_detectees']:
-            self._afficher_section("🚫 Erreurs à corriger:", 
-                                  resultats['erreurs_detectees'], 
-                                  Config.COLOR_WARNING)
+        y = self._placer_separateur(0, y + 10)
+        
+        # Points présents / partiels / manquants, erreurs détectées
+        for cle, titre, champ, couleur in self._SECTIONS:
+            if resultats[champ]:
+                y = self._afficher_section(cle, resultats[champ], y, text=titre, fill=couleur)
         
         # Suggestions
         if resultats['suggestions']:
-            ttk.Separator(self.resultats_frame, orient='horizontal').pack(fill='x', pady=10)
-            
-            tk.Label(
-                self.resultats_frame,
-                text="💡 Suggestions d'amélioration:",
-                font=('Arial', 11, 'bold'),
-                bg='white',
-                fg=Config.COLOR_PRIMARY
-            ).pack(anchor='w', pady=(5, 5))
-            
-            for suggestion in resultats['suggestions']:
-                tk.Label(
-                    self.resultats_frame,
-                    text=f"  • {suggestion}",
-                    font=('Arial', 9),
-                    bg='white',
-                    wraplength=550,
-                    justify='left'
-                ).pack(anchor='w', padx=10)
-
-        # --- NOUVELLE PARTIE : Affichage du Prompt ---
-        ttk.Separator(self.resultats_frame, orient='horizontal').pack(fill='x', pady=(20, 10))
-            
-        tk.Label(
-            self.resultats_frame,
-            text="🤖 Contexte de l'évaluation IA :",
-            font=('Arial', 11, 'bold'),
-            bg='white',
-            fg=Config.COLOR_PRIMARY
-        ).pack(anchor='w', pady=(5, 5))
+            y = self._placer_separateur(1, y + 10)
+            y = self._afficher_section('suggestions', resultats['suggestions'], y)
         
-        prompt_display = scrolledtext.ScrolledText(
-            self.resultats_frame,
-            height=6,
-            wrap='word',
-            font=('Courier', 9, 'italic'),
-            bg='#f8f9fa',
-            fg='#555'
-        )
-        prompt_display.pack(fill='x', expand=True, pady=5)
-        prompt_display.insert('1.0', prompt_utilise)
-        prompt_display.config(state='disabled')
-        # --- FIN NOUVELLE PARTIE ---
-
+        # --- Affichage du Prompt ---
+        y = self._placer_separateur(2, y + 20)
+        y = self._placer(self._item_prompt_titre, 0, y + 15)
+        
+        self.prompt_display.config(state='normal')
+        self.prompt_display.delete('1.0', 'end')
+        self.prompt_display.insert('1.0', prompt_utilise)
+        self.prompt_display.config(state='disabled')
+        y = self._placer(self._item_prompt, 0, y + 5, width=self._largeur_resultats)
+        
+        self.resultats_canvas.configure(height=y + 5)
     
-    def _afficher_section(self, titre, elements, couleur):
-        """Affiche une section de résultats"""
-        tk.Label(
-            self.resultats_frame,
-            text=titre,
-            font=('Arial', 10, 'bold'),
-            bg='white',
-            fg=couleur
-        ).pack(anchor='w', pady=(10, 5))
-        
-        for elem in elements:
-            tk.Label(
-                self.resultats_frame,
-                text=f"  • {elem}",
-                font=('Arial', 9),
-                bg='white',
-                wraplength=550,
-                justify='left'
-            ).pack(anchor='w', padx=10)
+    def _afficher_section(self, cle, elements, y, **options_titre):
+        """Affiche une section de résultats (titre + une ligne par élément)"""
+        y = self._placer(self._items_titres[cle], 0, y + 10, **options_titre) + 5
+        texte = '\n'.join(f"  • {elem}" for elem in elements)
+        return self._placer(self._items_puces[cle], 10, y, text=texte)
 
 # ============================================================================
 # MENU PRINCIPAL
@@ -989,6 +1438,10 @@ class MenuPrincipal:
         self.root.geometry("500x400")
         self.root.configure(bg=Config.COLOR_BG)
         
+        # Gestionnaire partagé par toutes les fenêtres : un seul cache, et les
+        # sauvegardes de la création rafraîchissent la liste d'évaluation
+        self.manager = QuestionManager()
+        
         self._create_widgets()
     
     def _create_widgets(self):
@@ -1051,12 +1504,12 @@ class MenuPrincipal:
     def ouvrir_creation(self):
         """Ouvre la fenêtre de création"""
         creation_window = tk.Toplevel(self.root)
-        CreationQuestionGUI(creation_window)
+        CreationQuestionGUI(creation_window, manager=self.manager)
     
     def ouvrir_evaluation(self):
         """Ouvre la fenêtre d'évaluation"""
         eval_window = tk.Toplevel(self.root)
-        EvaluationQuestionGUI(eval_window)
+        EvaluationQuestionGUI(eval_window, manager=self.manager)
     
     def run(self):
         """Lance l'application"""
@@ -1072,7 +1525,7 @@ if __name__ == "__main__":
     print("=" * 60)
     print("\n📚 Fonctionnalités:")
     print("  • Création de questions avec interface graphique")
-    print("  • Sauvegarde automatique en format pickle")
+    print("  • Sauvegarde automatique dans une base SQLite")
     print("  • Évaluation intelligente des réponses (Gemini ou Locale)")
     print("  • Analyse NLP avec spaCy (optionnel)")
     print("\n💡 Astuce: Pour l'évaluation IA, configurez GOOGLE_API_KEY")
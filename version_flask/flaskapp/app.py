@@ -1,8 +1,8 @@
-from flask import Flask
+from flask import Flask, g
 from flask_login import LoginManager, current_user
 from config import Config
 from storage import get_user
-from schemas import LoginUser
+from schemas import LoginUser, ns_to_datetime
 
 def create_app():
     app = Flask(__name__)
@@ -13,8 +13,18 @@ def create_app():
 
     @login_manager.user_loader
     def load_user(email: str):
+        # g est propre à chaque requête : au plus une lecture du store par requête
+        cached = g.get("_cached_user")
+        if cached is not None and cached.email == email:
+            return cached
         u = get_user(email)
-        return LoginUser(u) if u else None
+        g._cached_user = LoginUser(u) if u else None
+        return g._cached_user
+
+    # Les horodatages sont des entiers (ns) : conversion seulement à l'affichage
+    @app.template_filter("ns_datetime")
+    def ns_datetime(ns: int, fmt: str = "%d/%m/%Y %H:%M") -> str:
+        return ns_to_datetime(ns).strftime(fmt)
 
     @app.get("/")
     def index():
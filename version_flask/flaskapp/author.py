@@ -4,8 +4,33 @@ from flask_login import login_required, current_user
 from storage import list_questions_by_owner, save_question, load_question, create_link
 from schemas import Question
 
+try:
+    import orjson  # optionnel, plus rapide que json
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 bp = Blueprint("author", __name__)
 
+_LIST_FIELDS = ("required_points", "forbidden_points", "attachments")
+
+def _decode_list_fields(form) -> dict:
+    """
+    Décode les champs *_json du formulaire en une passe ; 400 si ce n'est pas une liste JSON.
+    Une liste vide devient None (valeur par défaut de Question).
+    """
+    out = {}
+    for name in _LIST_FIELDS:
+        raw = form.get(f"{name}_json", "") or "[]"
+        try:
+            value = _json_loads(raw)
+        except ValueError:
+            abort(400, f"JSON invalide : {name}")
+        if not isinstance(value, list):
+            abort(400, f"Liste JSON attendue : {name}")
+        out[name] = value or None
+    return out
+
 @bp.get("/dashboard")
 @login_required
 def dashboard():
@@ -30,9 +55,7 @@ def create_question():
         title=request.form.get("title", "").strip(),
         statement=request.form.get("statement", "").strip(),
         expected_answer=request.form.get("expected_answer", "").strip(),
-        required_points=json.loads(request.form.get("required_points_json", "[]") or "[]"),
-        forbidden_points=json.loads(request.form.get("forbidden_points_json", "[]") or "[]"),
-        attachments=json.loads(request.form.get("attachments_json", "[]") or "[]"),
+        **_decode_list_fields(request.form),
     )
     save_question(q)
     return redirect(url_for("author.view_question", num=q.num))
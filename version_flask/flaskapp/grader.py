@@ -1,7 +1,62 @@
 import json
+import math
 import re
+import threading
+from collections import Counter
 from difflib import SequenceMatcher
-from typing import Any
+from typing import Any, Optional
+
+try:
+    import ahocorasick  # pyahocorasick, optionnel
+except ImportError:
+    ahocorasick = None
+
+# une référence à un groupe (arrière, ou condition "(?(1)...)") change de sens
+# une fois le motif fusionné : les groupes y sont renumérotés
+_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+# drapeaux globaux en tête de motif, ex. "(?x)" ou "(?s)(?i)"
+_GLOBAL_FLAGS_RE = re.compile(r"^(?:\(\?[aiLmsux]+\))+")
+
+
+def _scoped(source: str) -> str:
+    # "(?x)motif" -> "(?x:motif)" : au milieu de l'alternance, un drapeau global
+    # s'appliquerait à tous les motifs (3.8-3.10) ou serait refusé (3.11+)
+    m = _GLOBAL_FLAGS_RE.match(source)
+    if not m:
+        return f"(?:{source})"
+    flags = "".join(sorted(set(m.group().replace("(?", "").replace(")", ""))))
+    # en mode verbeux, un commentaire "# ..." final avalerait la parenthèse fermante
+    end = "\n)" if "x" in flags else ")"
+    return f"(?{flags}:{source[m.end():]}{end}"
+
+
+# Gabarit du feedback : même sortie que json.dumps(..., ensure_ascii=False, indent=2)
+# mais sans parcourir le dict à chaque correction (les points sont pré-encodés).
+_FEEDBACK_TEMPLATE = (
+    '{\n'
+    '  "similarity_score": %s,\n'
+    '  "required_found": %s,\n'
+    '  "required_missing": %s,\n'
+    '  "forbidden_detected": %s,\n'
+    '  "final": %s\n'
+    '}'
+)
+
+
+def _point_json(spec) -> str:
+    # encodé une fois, déjà indenté pour sa place dans une liste du feedback
+    return json.dumps(spec, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+
+
+def _json_list(items: list[str]) -> str:
+    if not items:
+        return "[]"
+    return "[\n    " + ",\n    ".join(items) + "\n  ]"
+
+
+def _trigrams(text: str) -> Counter:
+    return Counter(text[i:i + 3] for i in range(len(text) - 2))
+
 
 class BaselineGrader:
     """
@@ -9,39 +64,136 @@ class BaselineGrader:
       - similarité avec la réponse attendue (0..40 points)
       - bonus +10 par point obligatoire trouvé
       - malus -10 par point interdit détecté
+
+    La similarité est un cosinus sur les trigrammes de caractères ;
+    `legacy_similarity=True` rétablit l'ancien calcul SequenceMatcher.
     """
-    def __init__(self, required_points: list[Any], forbidden_points: list[Any], expected: str):
+    def __init__(self, required_points: list[Any], forbidden_points: list[Any], expected: str,
+                 legacy_similarity: bool = False):
         self.req = required_points or []
         self.forb = forbidden_points or []
         self.expected = expected or ""
+        self.legacy_similarity = legacy_similarity
+        self._expected_lower = self.expected.lower()
+        self._expected_ngrams = _trigrams(self._expected_lower)
+        self._expected_norm = math.sqrt(sum(c * c for c in self._expected_ngrams.values()))
+        # points pré-compilés une fois par version de la question (voir get_grader) :
+        # ("str", texte en minuscules) ou ("re", motif)
+        self._req_matchers = [self._compile_point(p) for p in self.req]
+        self._forb_matchers = [self._compile_point(p) for p in self.forb]
+        self._any_regex = self._build_prefilter(self._req_matchers + self._forb_matchers)
+        self._automaton = self._build_automaton(self._req_matchers + self._forb_matchers)
+        self._req_json = [_point_json(p) for p in self.req]
+        self._forb_json = [_point_json(p) for p in self.forb]
 
-    def _check_point(self, spec, text: str) -> bool:
+    @staticmethod
+    def _compile_point(spec):
         if isinstance(spec, str):
-            return spec.lower() in text.lower()
+            return "str", spec.lower()
         if isinstance(spec, dict) and spec.get("type") == "regex":
-            return re.search(spec.get("value", ""), text, flags=re.I) is not None
+            return "re", re.compile(spec.get("value", ""), flags=re.I)
+        return None, None
+
+    @staticmethod
+    def _build_prefilter(matchers):
+        # Fusionne tous les motifs en une alternance : un seul parcours du texte
+        # suffit à savoir qu'aucun point regex ne peut correspondre.
+        sources = [m.pattern for kind, m in matchers if kind == "re"]
+        if not sources or any(_BACKREF_RE.search(s) for s in sources):
+            return None
+        try:
+            return re.compile("|".join(_scoped(s) for s in sources), flags=re.I)
+        except re.error:
+            return None
+
+    @staticmethod
+    def _build_automaton(matchers):
+        # Un automate Aho-Corasick trouve tous les points texte en un seul
+        # parcours de la réponse ; sans pyahocorasick on garde `in`.
+        words = {m for kind, m in matchers if kind == "str" and m}
+        if ahocorasick is None or not words:
+            return None
+        automaton = ahocorasick.Automaton()
+        for w in words:
+            automaton.add_word(w, w)
+        automaton.make_automaton()
+        return automaton
+
+    def _check_point(self, matcher, text: str, text_lower: str, regex_possible: bool = True,
+                     str_hits: Optional[set[str]] = None) -> bool:
+        kind, m = matcher
+        if kind == "str":
+            if str_hits is None or not m:
+                return m in text_lower
+            return m in str_hits
+        if kind == "re":
+            return regex_possible and m.search(text) is not None
         return False
 
+    def _similarity(self, text_lower: str) -> float:
+        if self.legacy_similarity:
+            return SequenceMatcher(None, text_lower, self._expected_lower).ratio()
+        ngrams = _trigrams(text_lower)
+        if not ngrams or not self._expected_ngrams:
+            # textes trop courts pour des trigrammes
+            return 1.0 if text_lower == self._expected_lower else 0.0
+        dot = sum(c * self._expected_ngrams[g] for g, c in ngrams.items())
+        norm = math.sqrt(sum(c * c for c in ngrams.values()))
+        return dot / (norm * self._expected_norm)
+
     def grade(self, answer: str) -> tuple[float, str]:
         text = answer or ""
+        text_lower = text.lower()
+        regex_possible = self._any_regex is None or self._any_regex.search(text) is not None
+        str_hits = None
+        if self._automaton is not None:
+            str_hits = {w for _, w in self._automaton.iter(text_lower)}
         # 1) similarité
-        sim = SequenceMatcher(None, text.lower(), self.expected.lower()).ratio()
+        sim = self._similarity(text_lower)
         base = round(sim * 40, 2)  # max 40
         # 2) requis
         found, missing = [], []
-        for p in self.req:
-            (found if self._check_point(p, text) else missing).append(p)
+        for pj, m in zip(self._req_json, self._req_matchers):
+            (found if self._check_point(m, text, text_lower, regex_possible, str_hits) else missing).append(pj)
         req_score = 10 * len(found)
         # 3) interdits
-        violated = [p for p in self.forb if self._check_point(p, text)]
+        violated = [pj for pj, m in zip(self._forb_json, self._forb_matchers)
+                    if self._check_point(m, text, text_lower, regex_possible, str_hits)]
         pen = 10 * len(violated)
 
         score = max(0, min(100, base + req_score - pen))
-        feedback = {
-            "similarity_score": base,
-            "required_found": found,
-            "required_missing": missing,
-            "forbidden_detected": violated,
-            "final": score,
-        }
-        return score, json.dumps(feedback, ensure_ascii=False, indent=2)
+        # repr() d'un int/float fini est identique à son encodage JSON
+        feedback = _FEEDBACK_TEMPLATE % (
+            repr(base), _json_list(found), _json_list(missing), _json_list(violated), repr(score),
+        )
+        return score, feedback
+
+    def grade_batch(self, answers: list[str]) -> list[tuple[float, str]]:
+        """Corrige une série de réponses ; les réponses identiques ne sont corrigées qu'une fois."""
+        done: dict[str, tuple[float, str]] = {}
+        out = []
+        for answer in answers:
+            key = answer or ""
+            if key not in done:
+                done[key] = self.grade(key)
+            out.append(done[key])
+        return out
+
+
+# -------- cache des correcteurs par question ---------------------------------
+
+_graders: dict[int, tuple[Any, BaselineGrader]] = {}
+_graders_lock = threading.Lock()
+
+def get_grader(q) -> BaselineGrader:
+    """
+    Correcteur de la question `q`, construit une seule fois puis réutilisé
+    tant que la question n'a pas été modifiée (q.updated_at).
+    """
+    with _graders_lock:
+        hit = _graders.get(q.num)
+        if hit and hit[0] == q.updated_at:
+            return hit[1]
+        g = BaselineGrader(q.required_points_or_empty, q.forbidden_points_or_empty, q.expected_answer)
+        _graders[q.num] = (q.updated_at, g)
+        return g
@@ -1,43 +1,113 @@
-from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Optional
+import sys
+import time
+from dataclasses import MISSING, dataclass, field, fields
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional, Sequence
 
 # ==== Données persistées en Pickle ==========================================
 
-@dataclass
-class User:
+# slots=True (sans __dict__ par instance) n'existe qu'à partir de Python 3.10
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Horodatages stockés en nanosecondes UTC (time.time_ns), plus légers qu'un datetime
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+
+def ns_to_datetime(ns: int) -> datetime:
+    """Horodatage en nanosecondes -> datetime UTC (pour l'affichage)"""
+    return _EPOCH + timedelta(microseconds=ns // 1000)
+
+
+def _datetime_to_ns(dt: datetime) -> int:
+    """datetime.utcnow() des anciens pickles -> nanosecondes"""
+    return (dt.replace(tzinfo=timezone.utc) - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
+@lru_cache(maxsize=None)
+def _state_names(cls) -> tuple[str, ...]:
+    return tuple(f.name for f in fields(cls) if f.init)
+
+
+class _SlotsPickle:
+    """
+    Pickle sous forme de tuple (valeurs des champs init, dans l'ordre), plus
+    compact qu'un dict. Les anciens fichiers à état dict se rechargent aussi ;
+    les champs absents prennent leur défaut (nouveaux champs : à ajouter en fin).
+    Les champs init=False sont des caches et ne sont pas sauvegardés.
+    """
+    __slots__ = ()
+
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, name) for name in _state_names(type(self)))
+
+    def __setstate__(self, state) -> None:
+        if not isinstance(state, dict):
+            state = dict(zip(_state_names(type(self)), state))
+        for f in fields(self):
+            if f.name in state:
+                value = state[f.name]
+            elif f.default is not MISSING:
+                value = f.default
+            else:
+                value = f.default_factory()
+            if f.name in _TIMESTAMP_FIELDS and isinstance(value, datetime):
+                value = _datetime_to_ns(value)
+            object.__setattr__(self, f.name, value)
+
+    def created_at_dt(self) -> datetime:
+        """created_at sous forme de datetime UTC"""
+        return ns_to_datetime(self.created_at)
+
+
+@dataclass(**_SLOTS)
+class User(_SlotsPickle):
     email: str
     password_hash: str
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: int = field(default_factory=time.time_ns)
 
-@dataclass
-class Question:
+@dataclass(**_SLOTS)
+class Question(_SlotsPickle):
     num: int
     owner_email: str
     title: str
     statement: str
-    attachments: list[str] = field(default_factory=list)
+    # Listes à None quand elles sont vides (cas courant) : pas d'allocation par instance
+    attachments: Optional[list[str]] = None
     expected_answer: str = ""
-    required_points: list[Any] = field(default_factory=list)     # str ou {"type":"regex","value":"..."}
-    forbidden_points: list[Any] = field(default_factory=list)
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    required_points: Optional[list[Any]] = None     # str ou {"type":"regex","value":"..."}
+    forbidden_points: Optional[list[Any]] = None
+    created_at: int = field(default_factory=time.time_ns)
+    updated_at: int = field(default_factory=time.time_ns)
+
+    @property
+    def attachments_or_empty(self) -> Sequence[str]:
+        return self.attachments or ()
 
-@dataclass
-class PublicLink:
+    @property
+    def required_points_or_empty(self) -> Sequence[Any]:
+        return self.required_points or ()
+
+    @property
+    def forbidden_points_or_empty(self) -> Sequence[Any]:
+        return self.forbidden_points or ()
+
+@dataclass(**_SLOTS)
+class PublicLink(_SlotsPickle):
     code: str
     question_num: int
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: int = field(default_factory=time.time_ns)
     expires_at: Optional[datetime] = None
 
-@dataclass
-class Attempt:
+@dataclass(**_SLOTS)
+class Attempt(_SlotsPickle):
     question_num: int
     student_email: str
     answer_text: str
     auto_score: float
     auto_feedback: str
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: int = field(default_factory=time.time_ns)
 
 
 # ==== Adaptateur pour Flask-Login ============================================
@@ -47,6 +117,8 @@ class LoginUser:
     Petit wrapper autour de User pour satisfaire Flask-Login
     (get_id/is_authenticated/...).
     """
+    __slots__ = ("_user", "email")
+
     def __init__(self, user: User):
         self._user = user
         self.email = user.email
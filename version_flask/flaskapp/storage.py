@@ -1,22 +1,92 @@
+import atexit
+import bisect
+import copy
+import logging
 import os
+import queue
 import pickle
 import tempfile
 import time
 import hashlib
+import hmac
+import inspect
+import mmap
+import struct
 import threading
-from datetime import datetime
-from typing import Optional
+import zlib
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
 
 from werkzeug.security import generate_password_hash, check_password_hash
 from schemas import User, Question, PublicLink, Attempt
 
+try:
+    import fcntl  # verrous entre processus (POSIX)
+except ImportError:
+    fcntl = None
+    import msvcrt  # Windows
+
+try:
+    import msgpack  # optionnel, plus compact et plus rapide que pickle
+except ImportError:
+    msgpack = None
+
+try:
+    import liburing  # optionnel (Linux 5.6+), lectures groupées via io_uring
+except ImportError:
+    liburing = None
+
 BASE = os.path.join(os.path.dirname(__file__), "data")
 USERS_FILE = os.path.join(BASE, "users.pickle")
 DIR_QUESTIONS = os.path.join(BASE, "questions")
 DIR_LINKS = os.path.join(BASE, "links")
 DIR_ATTEMPTS = os.path.join(BASE, "attempts")
+OWNER_INDEX = os.path.join(BASE, "questions_by_owner.pickle")
+
+# Un verrou par ressource (fichier) : les écritures indépendantes ne se bloquent
+# pas entre elles. Les lectures s'en passent, os.replace étant atomique.
+_locks: defaultdict[str, threading.Lock] = defaultdict(threading.Lock)
+_locks_master = threading.Lock()
+
+def _lock_for(path: str) -> threading.Lock:
+    with _locks_master:
+        return _locks[path]
+
+# Windows ouvre en mode texte par défaut (CRLF traduit, arrêt sur 0x1A)
+_O_RDONLY_BINARY = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+@contextmanager
+def _process_lock(path: str):
+    """Verrou exclusif entre processus (plusieurs workers) sur `path`.lock."""
+    with open(path + ".lock", "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK abandonne après 10 s : on réessaie
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+_MMAP_MIN_SIZE = 4096  # au-delà d'une page, lecture par mmap sans copie
+# Pool partagé pour charger en parallèle les petits fichiers d'une liste
+_io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="storage-io")
 
-_lock = threading.Lock()
+# Cache des fichiers chargés : chemin -> (st_mtime_ns, objet). Les objets en
+# cache ne sont jamais modifiés : les fonctions publiques rendent des copies
+# des enregistrements et gardent une copie de ce qu'on leur fait enregistrer.
+_load_cache: dict[str, tuple[int, Any]] = {}
 
 
 def _ensure_dirs():
@@ -26,73 +96,385 @@ def _ensure_dirs():
 
 _ensure_dirs()
 
+# -------- sérialisation ------------------------------------------------------
+
+# Avec msgpack : octet de version _MSGPACK_V1 puis les données, chaque
+# enregistrement étant une extension [nom de classe, *état] (état du tuple
+# de _SlotsPickle). Sinon, ou si un champ n'est pas encodable (datetime…),
+# pickle brut, reconnaissable à son premier octet PROTO (0x80).
+_MSGPACK_V1 = b"\x01"
+_EXT_RECORD = 1
+_RECORDS = {cls.__name__: cls for cls in (User, Question, PublicLink, Attempt)}
+
+def _msgpack_default(obj):
+    if type(obj).__name__ in _RECORDS:
+        state = [type(obj).__name__, *obj.__getstate__()]
+        return msgpack.ExtType(_EXT_RECORD, msgpack.packb(state, default=_msgpack_default))
+    raise TypeError(f"non encodable : {type(obj).__name__}")
+
+def _msgpack_ext_hook(code: int, data: bytes):
+    if code != _EXT_RECORD:
+        return msgpack.ExtType(code, data)
+    name, *state = msgpack.unpackb(data, ext_hook=_msgpack_ext_hook)
+    obj = _RECORDS[name].__new__(_RECORDS[name])
+    obj.__setstate__(state)
+    return obj
+
+def _dumps(obj) -> bytes:
+    if msgpack is not None:
+        try:
+            return _MSGPACK_V1 + msgpack.packb(obj, default=_msgpack_default)
+        except TypeError:
+            pass
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _loads(data) -> Any:
+    if data[:1] != _MSGPACK_V1:
+        return pickle.loads(data)  # anciens fichiers et repli pickle
+    if msgpack is None:
+        raise RuntimeError("données msgpack : installez le paquet msgpack")
+    return msgpack.unpackb(memoryview(data)[1:], ext_hook=_msgpack_ext_hook)
+
 # -------- utilitaires fichier atomique ---------------------------------------
 
+# Linux : un fichier anonyme (O_TMPFILE) rendu visible par linkat() n'apparaît
+# jamais sous un nom temporaire et n'a rien à nettoyer en cas d'échec.
+_O_TMPFILE = getattr(os, "O_TMPFILE", None)
+_dir_fds: dict[str, int] = {}  # dossiers de données ouverts une fois (openat/linkat)
+
+def _dir_fd(directory: str) -> int:
+    fd = _dir_fds.get(directory)
+    if fd is None:
+        opened = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        fd = _dir_fds.setdefault(directory, opened)
+        if fd != opened:  # un autre thread l'a ouvert entre-temps
+            os.close(opened)
+    return fd
+
+def _link_tmpfile(data: bytes, path: str) -> Optional[int]:
+    """Crée `path` via O_TMPFILE + linkat ; retourne son mtime, ou None si impossible."""
+    directory, name = os.path.split(path)
+    try:
+        dir_fd = _dir_fd(directory)
+        fd = os.open(".", _O_TMPFILE | os.O_WRONLY, 0o600, dir_fd=dir_fd)
+    except OSError:
+        return None  # noyau ou système de fichiers sans O_TMPFILE
+    with os.fdopen(fd, "wb", buffering=0) as f:
+        f.write(data)
+        mtime = os.fstat(fd).st_mtime_ns
+        try:
+            # dst_dir_fd impose linkat(..., AT_SYMLINK_FOLLOW) : suit le lien /proc
+            os.link(f"/proc/self/fd/{fd}", name, dst_dir_fd=dir_fd)
+        except OSError:
+            return None  # cible déjà présente (link ne remplace pas) ou /proc absent
+    return mtime
+
 def _atomic_dump(obj, path: str):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # les dossiers cibles sont créés une fois par _ensure_dirs()
+    # sérialisé en mémoire puis écrit en un seul write()
+    data = _dumps(obj)
+    # fichier a priori nouveau (jamais lu ni écrit ici) : tentative O_TMPFILE
+    if _O_TMPFILE is not None and path not in _load_cache:
+        mtime = _link_tmpfile(data, path)
+        if mtime is not None:
+            _load_cache[path] = (mtime, _cached(obj))
+            return
     fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_")
     try:
-        with os.fdopen(fd, "wb") as f:
-            pickle.dump(obj, f)
+        with os.fdopen(fd, "wb", buffering=0) as f:
+            f.write(data)
+            # le renommage ne change pas la date de modification du fichier
+            mtime = os.fstat(f.fileno()).st_mtime_ns
         os.replace(tmp, path)
-    finally:
+    except BaseException:
+        # après un os.replace réussi tmp n'existe plus : nettoyage en cas d'échec seulement
         try:
             os.remove(tmp)
         except FileNotFoundError:
             pass
+        raise
+    _load_cache[path] = (mtime, _cached(obj))
+
+def _cached(obj):
+    # l'appelant garde son instance, le cache une copie (superficielle)
+    return copy.copy(obj) if type(obj).__name__ in _RECORDS else obj
 
 def _atomic_load(path: str, default):
-    if not os.path.exists(path):
+    """Charge `path`, ou renvoie la version en cache si le fichier n'a pas changé."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        _load_cache.pop(path, None)
         return default
-    with open(path, "rb") as f:
-        return pickle.load(f)
+    hit = _load_cache.get(path)
+    if hit and hit[0] == st.st_mtime_ns:
+        return hit[1]
+    # os.open/os.read bruts : open() ajouterait fstat, isatty et lseek
+    try:
+        fd = os.open(path, _O_RDONLY_BINARY)
+    except FileNotFoundError:  # supprimé depuis le stat
+        _load_cache.pop(path, None)
+        return default
+    try:
+        if st.st_size > _MMAP_MIN_SIZE:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as m:
+                if hasattr(m, "madvise"):  # Linux/Unix, Python 3.8+
+                    m.madvise(mmap.MADV_SEQUENTIAL)
+                obj = _loads(m)
+        else:
+            obj = _loads(_read_fd(fd, st.st_size))
+    finally:
+        os.close(fd)
+    _load_cache[path] = (st.st_mtime_ns, obj)
+    return obj
+
+def _read_fd(fd: int, size: int) -> bytes:
+    """Lit tout `fd` dont la taille attendue est `size` : un seul read() en général."""
+    data = os.read(fd, size + 1)  # +1 : un octet de trop signale un fichier remplacé, plus grand
+    if len(data) <= size:
+        return data
+    parts = [data]
+    while chunk := os.read(fd, 1 << 16):
+        parts.append(chunk)
+    return b"".join(parts)
+
+# USE_IO_URING=1 : les fichiers absents du cache sont ouverts, lus puis fermés
+# par lots (un appel système par étape au lieu d'un par fichier).
+_URING_BATCH = 256  # entrées par anneau
+_URING_API = ("Ring", "Cqe", "io_uring_queue_init", "io_uring_queue_exit", "io_uring_get_sqe",
+              "io_uring_prep_open", "io_uring_prep_read", "io_uring_prep_close",
+              "io_uring_submit_and_wait", "io_uring_wait_cqe", "io_uring_cq_ready",
+              "io_uring_cq_advance")
+
+def _probe_uring_read():
+    """Adaptateur (sqe, fd, buf) pour io_uring_prep_read, ou None si la liaison ne convient pas."""
+    if liburing is None or not all(hasattr(liburing, name) for name in _URING_API):
+        return None
+    prep = liburing.io_uring_prep_read
+    try:
+        params = inspect.signature(prep).parameters
+    except (TypeError, ValueError):
+        return None
+    # selon la version : (sqe, fd, buf, offset) ou, calqué sur le C, (sqe, fd, buf, nbytes, offset)
+    if "nbytes" in params or len(params) >= 5:
+        return lambda sqe, fd, buf: prep(sqe, fd, buf, len(buf), 0)
+    if "offset" in params:
+        return lambda sqe, fd, buf: prep(sqe, fd, buf, offset=0)
+    return None
+
+_uring_prep_read = _probe_uring_read() if os.environ.get("USE_IO_URING") == "1" else None
+_use_io_uring = _uring_prep_read is not None
+
+def _uring_run(ring, cqe, preps: list) -> list[int]:
+    """Soumet une opération par élément de `preps` ; résultats dans le même ordre (-1 si erreur)."""
+    for i, prep in enumerate(preps):
+        sqe = liburing.io_uring_get_sqe(ring)
+        prep(sqe)
+        sqe.user_data = i
+    liburing.io_uring_submit_and_wait(ring, len(preps))
+    res = [-1] * len(preps)
+    done = 0
+    while done < len(preps):
+        liburing.io_uring_wait_cqe(ring, cqe)
+        ready = liburing.io_uring_cq_ready(ring)
+        for i in range(ready):
+            entry = cqe[i]
+            try:
+                res[entry.user_data] = entry.res
+            except OSError:  # res négatif (errno) levé par la liaison
+                pass
+        liburing.io_uring_cq_advance(ring, ready)
+        done += ready
+    return res
+
+def _uring_read(paths: list[str], sizes: list[int]) -> list[Optional[bytearray]]:
+    """Lit entièrement chaque fichier (None pour ceux absents ou modifiés entre-temps)."""
+    ring, cqe = liburing.Ring(), liburing.Cqe()
+    liburing.io_uring_queue_init(len(paths), ring)
+    try:
+        fds = _uring_run(ring, cqe, [
+            lambda sqe, p=p: liburing.io_uring_prep_open(sqe, p, os.O_RDONLY) for p in paths])
+        opened = [i for i, fd in enumerate(fds) if fd >= 0]
+        bufs: list[Optional[bytearray]] = [None] * len(paths)
+        for i in opened:
+            # +1 : un octet de trop signale un fichier remplacé par un plus grand
+            bufs[i] = bytearray(sizes[i] + 1)
+        try:
+            lus = _uring_run(ring, cqe, [
+                lambda sqe, i=i: _uring_prep_read(sqe, fds[i], bufs[i]) for i in opened])
+        finally:
+            _uring_run(ring, cqe, [lambda sqe, i=i: liburing.io_uring_prep_close(sqe, fds[i]) for i in opened])
+    finally:
+        liburing.io_uring_queue_exit(ring)
+    for i, n in zip(opened, lus):
+        if n == sizes[i]:
+            del bufs[i][n:]
+        else:
+            bufs[i] = None  # taille changée depuis le stat : relu par _atomic_load
+    return bufs
+
+def _disable_uring(error: Exception):
+    global _use_io_uring
+    if _use_io_uring:
+        logging.getLogger(__name__).warning("io_uring indisponible, pool de threads : %s", error)
+        _use_io_uring = False
+
+def _load_many_uring(paths: list[str]) -> list:
+    objs: list = [None] * len(paths)
+    misses: list[tuple[int, int]] = []  # (position, st_mtime_ns)
+    sizes: list[int] = []
+    for i, path in enumerate(paths):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            _load_cache.pop(path, None)
+            continue
+        hit = _load_cache.get(path)
+        if hit and hit[0] == st.st_mtime_ns:
+            objs[i] = hit[1]
+        else:
+            misses.append((i, st.st_mtime_ns))
+            sizes.append(st.st_size)
+    for start in range(0, len(misses), _URING_BATCH):
+        chunk = misses[start:start + _URING_BATCH]
+        bufs = [None] * len(chunk)  # None : lu un par un ci-dessous
+        if _use_io_uring:
+            try:
+                bufs = _uring_read([paths[i] for i, _ in chunk], sizes[start:start + _URING_BATCH])
+            except Exception as e:  # io_uring refusé (seccomp, noyau ancien) ou liaison incompatible
+                _disable_uring(e)
+        for (i, mtime), data in zip(chunk, bufs):
+            if data is None:
+                objs[i] = _atomic_load(paths[i], None)
+            else:
+                objs[i] = _loads(data)
+                _load_cache[paths[i]] = (mtime, objs[i])
+    return objs
+
+def _load_many(paths: list[str]) -> list:
+    """Charge plusieurs fichiers en parallèle (ordre conservé, absents ignorés)."""
+    if len(paths) < 2:
+        objs = [_atomic_load(p, None) for p in paths]
+    elif _use_io_uring:
+        objs = _load_many_uring(paths)
+    else:
+        objs = list(_io_pool.map(lambda p: _atomic_load(p, None), paths))
+    return [o for o in objs if o is not None]
+
+def _pickle_files(directory: str) -> list[str]:
+    """Chemins des *.pickle de `directory` en un seul scandir ([] s'il n'existe pas)."""
+    try:
+        with os.scandir(directory) as it:
+            return [e.path for e in it
+                    if e.name.endswith(".pickle") and e.is_file(follow_symlinks=False)]
+    except FileNotFoundError:
+        return []
 
 # -------- users --------------------------------------------------------------
 
+# Vérifications récentes : email -> (expiration, HMAC(hash + mot de passe), résultat).
+# Seul un HMAC à clé de processus est gardé en mémoire, jamais le mot de passe.
+_VERIFY_TTL = 60.0
+_VERIFY_MAX = 1024
+_verify_key = os.urandom(32)
+_verify_cache: OrderedDict[str, tuple[float, bytes, bool]] = OrderedDict()
+_verify_lock = threading.Lock()
+
 def get_user(email: str) -> Optional[User]:
     users: dict[str, User] = _atomic_load(USERS_FILE, {})
-    return users.get(email)
+    return copy.copy(users.get(email))
 
-def create_user(email: str, password: str) -> User:
-    with _lock:
-        users: dict[str, User] = _atomic_load(USERS_FILE, {})
-        if email in users:
+def _insert_user(u: User):
+    with _lock_for(USERS_FILE):
+        # copie : le dict en cache reste intact si l'écriture échoue
+        users: dict[str, User] = dict(_atomic_load(USERS_FILE, {}))
+        if u.email in users:
             raise ValueError("email exists")
-        u = User(email=email, password_hash=generate_password_hash(password))
-        users[email] = u
+        users[u.email] = copy.copy(u)
         _atomic_dump(users, USERS_FILE)
-        return u
+
+def create_user(email: str, password: str) -> User:
+    if get_user(email) is not None:
+        raise ValueError("email exists")  # avant de payer le hachage scrypt
+    u = User(email=email, password_hash=generate_password_hash(password))
+    _insert_user(u)
+    return u
 
 def verify_user(email: str, password: str) -> Optional[User]:
     u = get_user(email)
-    if u and check_password_hash(u.password_hash, password):
-        return u
-    return None
+    if u is None:
+        return None
+    # le hachage stocké fait partie de la clé : changer de mot de passe invalide l'entrée
+    digest = hmac.new(_verify_key, f"{u.password_hash}\0{password}".encode(), hashlib.sha256).digest()
+    now = time.monotonic()
+    with _verify_lock:
+        hit = _verify_cache.get(email)
+        if hit and hit[0] > now and hmac.compare_digest(hit[1], digest):
+            _verify_cache.move_to_end(email)
+            return u if hit[2] else None
+    ok = check_password_hash(u.password_hash, password)
+    with _verify_lock:
+        _verify_cache[email] = (now + _VERIFY_TTL, digest, ok)
+        _verify_cache.move_to_end(email)
+        while len(_verify_cache) > _VERIFY_MAX:
+            _verify_cache.popitem(last=False)
+    return u if ok else None
 
 # -------- questions ----------------------------------------------------------
 
 def _q_path(num: int) -> str:
     return os.path.join(DIR_QUESTIONS, f"{num}.pickle")
 
+def _load_owner_index() -> dict[str, list[int]]:
+    """Index email -> numéros de questions ; reconstruit par un scan s'il manque."""
+    idx = _atomic_load(OWNER_INDEX, None)
+    if idx is not None:
+        return idx
+    with _lock_for(OWNER_INDEX), _process_lock(OWNER_INDEX):
+        return _owner_index_locked()
+
+def _owner_index_locked() -> dict[str, list[int]]:
+    # appelée sous les deux verrous de l'index : relue sur disque, un autre
+    # processus a pu l'écrire dans la même tranche de mtime que notre cache
+    _load_cache.pop(OWNER_INDEX, None)
+    idx = _atomic_load(OWNER_INDEX, None)
+    if idx is not None:
+        return idx
+    idx = {}
+    for path in _pickle_files(DIR_QUESTIONS):
+        q: Question = _atomic_load(path, None)
+        if q:
+            idx.setdefault(q.owner_email, []).append(q.num)
+    for nums in idx.values():
+        nums.sort()
+    _atomic_dump(idx, OWNER_INDEX)
+    return idx
+
 def save_question(q: Question):
-    q.updated_at = datetime.utcnow()
-    _atomic_dump(q, _q_path(q.num))
+    q.updated_at = time.time_ns()
+    # ordre fixe (question puis index) pour éviter tout interblocage ; l'index est
+    # lu puis réécrit sous un verrou de fichier pour ne rien perdre entre workers
+    with _lock_for(_q_path(q.num)):
+        _atomic_dump(q, _q_path(q.num))
+        with _lock_for(OWNER_INDEX), _process_lock(OWNER_INDEX):
+            idx = _owner_index_locked()
+            if q.num in idx.get(q.owner_email, ()):
+                return  # l'index est déjà à jour (même auteur)
+            # copie : l'index en cache reste intact si l'écriture échoue ;
+            # un numéro n'appartient qu'à un seul auteur, retiré des autres listes
+            idx = {email: [n for n in nums if n != q.num] if q.num in nums else nums
+                   for email, nums in idx.items()}
+            nums = idx[q.owner_email] = list(idx.get(q.owner_email, ()))
+            bisect.insort(nums, q.num)
+            _atomic_dump(idx, OWNER_INDEX)
 
 def load_question(num: int) -> Optional[Question]:
-    p = _q_path(num)
-    if not os.path.exists(p):
-        return None
-    return _atomic_load(p, None)
+    return copy.copy(_atomic_load(_q_path(num), None))
 
 def list_questions_by_owner(email: str) -> list[Question]:
-    out: list[Question] = []
-    for fname in os.listdir(DIR_QUESTIONS):
-        if not fname.endswith(".pickle"):
-            continue
-        q: Question = _atomic_load(os.path.join(DIR_QUESTIONS, fname), None)
-        if q and q.owner_email == email:
-            out.append(q)
-    return sorted(out, key=lambda x: x.num)
+    # lecture sans verrou : l'index n'est remplacé que par os.replace/linkat
+    nums = _load_owner_index().get(email, [])
+    return [copy.copy(q) for q in _load_many([_q_path(num) for num in nums]) if q.owner_email == email]
 
 # -------- liens publics ------------------------------------------------------
 
@@ -100,33 +482,239 @@ def _l_path(code: str) -> str:
     return os.path.join(DIR_LINKS, f"{code}.pickle")
 
 def create_link(question_num: int) -> PublicLink:
-    code = hashlib.sha1(f"{question_num}-{time.time()}".encode()).hexdigest()[:10]
+    code = hashlib.blake2b(f"{question_num}-{time.time_ns()}".encode(), digest_size=5).hexdigest()
     link = PublicLink(code=code, question_num=question_num)
-    _atomic_dump(link, _l_path(code))
+    _save_link(link)
     return link
 
+def _save_link(link: PublicLink):
+    _atomic_dump(link, _l_path(link.code))
+
 def load_link(code: str) -> Optional[PublicLink]:
-    p = _l_path(code)
-    if not os.path.exists(p):
-        return None
-    return _atomic_load(p, None)
+    return copy.copy(_atomic_load(_l_path(code), None))
 
 # -------- tentatives ---------------------------------------------------------
 
+# Une tentative = une trame [marqueur][longueur][crc32 (uint32 LE)][_dumps]
+# ajoutée au journal DIR_ATTEMPTS/<num>.log ; les anciens fichiers
+# <num>/*.pickle restent lus. Une trame abîmée (écriture interrompue) est
+# sautée : la lecture reprend au marqueur suivant.
+_FRAME_MAGIC = b"\xa5At\x01"
+_FRAME = struct.Struct("<4sII")
+# Cache des journaux lus : chemin -> ((st_mtime_ns, st_size), tentatives)
+_log_cache: dict[str, tuple[tuple[int, int], list[Attempt]]] = {}
+
+def _a_log(question_num: int) -> str:
+    return os.path.join(DIR_ATTEMPTS, f"{question_num}.log")
+
+# Les tentatives arrivent en rafales : save_attempt se contente de les mettre
+# en file, un thread les écrit par lots (une écriture par journal et par lot).
+_FLUSH_BATCH = 64
+_FLUSH_INTERVAL = 0.05  # secondes
+_RETRY_DELAY = 1.0  # avant de réécrire un lot en échec
+_attempt_q: queue.SimpleQueue = queue.SimpleQueue()
+_flusher_thread: Optional[threading.Thread] = None
+_flusher_lock = threading.Lock()
+# Tentatives reçues mais pas encore écrites, par question : list_attempts les
+# sert avec le journal au lieu d'attendre le thread d'écriture.
+_pending: dict[int, list[Attempt]] = {}
+_pending_lock = threading.Lock()
+
+def _write_attempts(batch: list[Attempt]):
+    by_log: dict[str, list[bytes]] = {}
+    for a in batch:
+        try:
+            data = _dumps(a)
+        except Exception:  # ne passera jamais : inutile de la réessayer
+            logging.getLogger(__name__).exception("tentative non sérialisable ignorée")
+            continue
+        frame = _FRAME.pack(_FRAME_MAGIC, len(data), zlib.crc32(data)) + data
+        by_log.setdefault(_a_log(a.question_num), []).append(frame)
+    failed: list[Attempt] = []
+    for path, frames in by_log.items():
+        try:
+            with _lock_for(path):
+                with open(path, "ab", buffering=0) as f:
+                    f.write(b"".join(frames))
+        except OSError:
+            logging.getLogger(__name__).exception("écriture de %s impossible, nouvel essai", path)
+            failed.extend(a for a in batch if _a_log(a.question_num) == path)
+    # écrites (ou jamais écrivables) : plus en attente ; les échecs y restent
+    keep = {id(a) for a in failed}
+    with _pending_lock:
+        for a in batch:
+            if id(a) in keep:
+                continue
+            pending = _pending.get(a.question_num)
+            if pending is not None:
+                pending[:] = [p for p in pending if p is not a]
+                if not pending:
+                    del _pending[a.question_num]
+    return failed
+
+def _flusher():
+    while True:
+        item = _attempt_q.get()
+        batch: list[Attempt] = []
+        waiters: list[threading.Event] = []
+        deadline = time.monotonic() + _FLUSH_INTERVAL
+        while True:
+            if isinstance(item, threading.Event):
+                waiters.append(item)  # flush_sync() : écrire tout de suite
+                break
+            batch.append(item)
+            timeout = deadline - time.monotonic()
+            if len(batch) >= _FLUSH_BATCH or timeout <= 0:
+                break
+            try:
+                item = _attempt_q.get(timeout=timeout)
+            except queue.Empty:
+                break
+        failed = _write_attempts(batch)
+        for w in waiters:
+            w.set()
+        if failed:
+            # déjà acceptées par save_attempt : remises en file (disque plein, droits…)
+            time.sleep(_RETRY_DELAY)
+            for a in failed:
+                _attempt_q.put(a)
+
+def _start_flusher():
+    global _flusher_thread
+    with _flusher_lock:
+        if _flusher_thread is None or not _flusher_thread.is_alive():
+            _flusher_thread = threading.Thread(target=_flusher, name="attempt-flusher", daemon=True)
+            _flusher_thread.start()
+
+def flush_sync(timeout: float = 5.0):
+    """Attend que toutes les tentatives déjà reçues soient écrites sur disque."""
+    if _flusher_thread is not None and _flusher_thread.is_alive():
+        done = threading.Event()
+        _attempt_q.put(done)
+        if done.wait(timeout):
+            return
+    # pas de thread (ou bloqué) : on vide la file ici
+    batch = []
+    while True:
+        try:
+            item = _attempt_q.get_nowait()
+        except queue.Empty:
+            break
+        if isinstance(item, threading.Event):
+            item.set()
+        else:
+            batch.append(item)
+    for a in _write_attempts(batch):
+        _attempt_q.put(a)  # gardées pour le prochain flush
+
+atexit.register(flush_sync)
+
 def save_attempt(a: Attempt):
-    qdir = os.path.join(DIR_ATTEMPTS, str(a.question_num))
-    os.makedirs(qdir, exist_ok=True)
-    stamp = int(a.created_at.timestamp())
-    key = hashlib.md5((a.student_email + a.answer_text).encode()).hexdigest()[:8]
-    path = os.path.join(qdir, f"{stamp}__{key}.pickle")
-    _atomic_dump(a, path)
+    # thread absent ou mort (après un fork, par exemple) : relancé
+    if _flusher_thread is None or not _flusher_thread.is_alive():
+        _start_flusher()
+    with _pending_lock:
+        _pending.setdefault(a.question_num, []).append(a)
+    _attempt_q.put(a)
 
-def list_attempts(question_num: int) -> list[Attempt]:
-    qdir = os.path.join(DIR_ATTEMPTS, str(question_num))
-    if not os.path.exists(qdir):
+def _read_attempt_log(path: str) -> list[Attempt]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
         return []
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _log_cache.get(path)
+    if hit and hit[0] == key:
+        return hit[1]
     out: list[Attempt] = []
-    for f in os.listdir(qdir):
-        if f.endswith(".pickle"):
-            out.append(_atomic_load(os.path.join(qdir, f), None))
-    return sorted(out, key=lambda a: a.created_at)
+    if st.st_size:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            out = _parse_attempt_log(m)
+    _log_cache[path] = (key, out)
+    return out
+
+def _parse_attempt_log(m: mmap.mmap) -> list[Attempt]:
+    out: list[Attempt] = []
+    pos, end = 0, len(m)
+    while pos + _FRAME.size <= end:
+        magic, n, crc = _FRAME.unpack_from(m, pos)
+        start = pos + _FRAME.size
+        # les tranches de mmap sont des copies : aucun pointeur exporté à libérer
+        data = m[start:start + n] if magic == _FRAME_MAGIC and start + n <= end else None
+        if data is None or zlib.crc32(data) != crc:
+            # trame abîmée, ou en cours d'écriture par un autre processus
+            pos = m.find(_FRAME_MAGIC, pos + 1)
+            if pos < 0:
+                break
+            continue
+        out.append(_loads(data))
+        pos = start + n
+    return out
+
+# Les anciens dossiers <num>/ ne reçoivent plus de fichiers (le journal les
+# remplace, sans sharding nécessaire) : leur contenu est gardé tant que le
+# mtime du dossier ne change pas, un stat au lieu d'un parcours complet.
+_legacy_cache: dict[int, tuple[int, list[Attempt]]] = {}
+
+def _legacy_attempts(question_num: int) -> list[Attempt]:
+    qdir = os.path.join(DIR_ATTEMPTS, str(question_num))
+    try:
+        mtime = os.stat(qdir).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    hit = _legacy_cache.get(question_num)
+    if hit and hit[0] == mtime:
+        return hit[1]
+    attempts = _load_many(_pickle_files(qdir))
+    _legacy_cache[question_num] = (mtime, attempts)
+    return attempts
+
+def list_attempts(question_num: int) -> list[Attempt]:
+    """Tentatives triées par date ; partagées avec le cache, donc en lecture seule."""
+    # file d'attente lue avant le journal : une tentative écrite entre les deux
+    # apparaît des deux côtés et n'est gardée qu'une fois
+    with _pending_lock:
+        pending = list(_pending.get(question_num, ()))
+    stored = _legacy_attempts(question_num) + _read_attempt_log(_a_log(question_num))
+    seen = {(a.created_at, a.student_email) for a in stored}
+    stored.extend(a for a in pending if (a.created_at, a.student_email) not in seen)
+    return sorted(stored, key=lambda a: a.created_at)
+
+# -------- backend SQLite (optionnel) -----------------------------------------
+
+def _attempt_nums() -> set[int]:
+    """Numéros de question ayant des tentatives (journaux et anciens dossiers)."""
+    with os.scandir(DIR_ATTEMPTS) as it:
+        names = [e.name[:-4] if e.name.endswith(".log") else e.name for e in it]
+    return {int(n) for n in names if n.isdigit()}
+
+def _use_sqlite():
+    """
+    STORAGE_BACKEND=sqlite : mêmes fonctions publiques, mais servies par une
+    base SQLite en WAL (data/app.db). Au premier démarrage les fichiers pickle
+    existants y sont importés ; le hachage, le cache de verify_user et la
+    génération des codes de lien restent ceux de ce module.
+    """
+    global get_user, _insert_user, save_question, load_question, list_questions_by_owner
+    global _save_link, load_link, save_attempt, list_attempts
+    import storage_sqlite as sql
+
+    if sql.init(os.path.join(BASE, "app.db")):
+        sql.import_records(
+            users=_atomic_load(USERS_FILE, {}).values(),
+            questions=_load_many(_pickle_files(DIR_QUESTIONS)),
+            links=_load_many(_pickle_files(DIR_LINKS)),
+            attempts=[a for num in _attempt_nums() for a in list_attempts(num)],
+        )
+
+    def save_question(q: Question):
+        q.updated_at = time.time_ns()
+        sql.save_question(q)
+
+    get_user, _insert_user = sql.get_user, sql.insert_user
+    load_question, list_questions_by_owner = sql.load_question, sql.list_questions_by_owner
+    _save_link, load_link = sql.save_link, sql.load_link
+    save_attempt, list_attempts = sql.save_attempt, sql.list_attempts
+
+if os.environ.get("STORAGE_BACKEND", "pickle") == "sqlite":
+    _use_sqlite()
@@ -0,0 +1,138 @@
+"""
+Backend SQLite (mode WAL) du stockage, activé par STORAGE_BACKEND=sqlite
+(voir la fin de storage.py). Les objets restent sérialisés en pickle dans
+une colonne BLOB ; seules les clés utiles aux recherches sont en colonnes.
+"""
+import pickle
+import sqlite3
+import threading
+from typing import Iterable, Optional
+
+from schemas import User, Question, PublicLink, Attempt
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT PRIMARY KEY,
+    body BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS questions (
+    num INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL,
+    updated_at INTEGER NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_owner ON questions(owner);
+CREATE TABLE IF NOT EXISTS links (
+    code TEXT PRIMARY KEY,
+    body BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    qnum INTEGER NOT NULL,
+    created_at INTEGER NOT NULL,
+    student TEXT NOT NULL,
+    body BLOB NOT NULL,
+    PRIMARY KEY (qnum, created_at, student)
+);
+"""
+
+# Requêtes constantes : le cache d'instructions de sqlite3 les prépare une fois
+_SQL_GET_USER = "SELECT body FROM users WHERE email = ?"
+_SQL_INSERT_USER = "INSERT INTO users (email, body) VALUES (?, ?)"
+_SQL_SAVE_QUESTION = "INSERT OR REPLACE INTO questions (num, owner, updated_at, body) VALUES (?, ?, ?, ?)"
+_SQL_LOAD_QUESTION = "SELECT body FROM questions WHERE num = ?"
+_SQL_QUESTIONS_BY_OWNER = "SELECT body FROM questions WHERE owner = ? ORDER BY num"
+_SQL_SAVE_LINK = "INSERT OR REPLACE INTO links (code, body) VALUES (?, ?)"
+_SQL_LOAD_LINK = "SELECT body FROM links WHERE code = ?"
+_SQL_SAVE_ATTEMPT = "INSERT OR REPLACE INTO attempts (qnum, created_at, student, body) VALUES (?, ?, ?, ?)"
+_SQL_LIST_ATTEMPTS = "SELECT body FROM attempts WHERE qnum = ? ORDER BY created_at"
+
+_path: Optional[str] = None
+_local = threading.local()  # une connexion par thread (serveur Flask multi-thread)
+
+
+def init(path: str) -> bool:
+    """Ouvre (ou crée) la base ; True si elle est encore vide (import à faire)."""
+    global _path
+    _path = path
+    row = _conn().execute("SELECT 1 FROM users UNION ALL SELECT 1 FROM questions LIMIT 1").fetchone()
+    return row is None
+
+
+def _conn() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        # autocommit : chaque écriture est sa propre transaction (un fsync WAL)
+        conn = sqlite3.connect(_path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.executescript(_SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+def _dumps(obj) -> bytes:
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _one(sql: str, params) -> Optional[object]:
+    row = _conn().execute(sql, params).fetchone()
+    return pickle.loads(row[0]) if row else None
+
+
+def _all(sql: str, params) -> list:
+    return [pickle.loads(body) for (body,) in _conn().execute(sql, params)]
+
+# -------- users --------------------------------------------------------------
+
+def get_user(email: str) -> Optional[User]:
+    return _one(_SQL_GET_USER, (email,))
+
+def insert_user(u: User):
+    try:
+        _conn().execute(_SQL_INSERT_USER, (u.email, _dumps(u)))
+    except sqlite3.IntegrityError:
+        raise ValueError("email exists") from None
+
+# -------- questions ----------------------------------------------------------
+
+def save_question(q: Question):
+    _conn().execute(_SQL_SAVE_QUESTION, (q.num, q.owner_email, q.updated_at, _dumps(q)))
+
+def load_question(num: int) -> Optional[Question]:
+    return _one(_SQL_LOAD_QUESTION, (num,))
+
+def list_questions_by_owner(email: str) -> list[Question]:
+    return _all(_SQL_QUESTIONS_BY_OWNER, (email,))
+
+# -------- liens publics ------------------------------------------------------
+
+def save_link(link: PublicLink):
+    _conn().execute(_SQL_SAVE_LINK, (link.code, _dumps(link)))
+
+def load_link(code: str) -> Optional[PublicLink]:
+    return _one(_SQL_LOAD_LINK, (code,))
+
+# -------- tentatives ---------------------------------------------------------
+
+def save_attempt(a: Attempt):
+    _conn().execute(_SQL_SAVE_ATTEMPT, (a.question_num, a.created_at, a.student_email, _dumps(a)))
+
+def list_attempts(question_num: int) -> list[Attempt]:
+    return _all(_SQL_LIST_ATTEMPTS, (question_num,))
+
+# -------- import des fichiers pickle -----------------------------------------
+
+def import_records(users: Iterable[User], questions: Iterable[Question],
+                   links: Iterable[PublicLink], attempts: Iterable[Attempt]):
+    """Copie les données existantes dans la base, en une seule transaction."""
+    conn = _conn()
+    with conn:
+        conn.execute("BEGIN")
+        conn.executemany("INSERT OR REPLACE INTO users (email, body) VALUES (?, ?)",
+                         ((u.email, _dumps(u)) for u in users))
+        conn.executemany(_SQL_SAVE_QUESTION,
+                         ((q.num, q.owner_email, q.updated_at, _dumps(q)) for q in questions))
+        conn.executemany(_SQL_SAVE_LINK, ((l.code, _dumps(l)) for l in links))
+        conn.executemany(_SQL_SAVE_ATTEMPT,
+                         ((a.question_num, a.created_at, a.student_email, _dumps(a)) for a in attempts))
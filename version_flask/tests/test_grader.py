@@ -0,0 +1,35 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "flaskapp"))
+
+from grader import BaselineGrader
+
+
+def _regex(*sources):
+    return [{"type": "regex", "value": s} for s in sources]
+
+
+class PrefilterTest(unittest.TestCase):
+    def test_conditional_group_is_not_merged(self):
+        # "(?(1)...)" désigne un autre groupe une fois les motifs fusionnés
+        for points in (_regex(r"(x)?y", r"(a)?(?(1)b|c)"), _regex(r"(a)?(?(1)b|c)", r"(x)?y")):
+            g = BaselineGrader(points, [], "")
+            self.assertIsNone(g._any_regex)
+            self.assertEqual(g.grade("ab")[0], 10.0)
+
+    def test_backreference_is_not_merged(self):
+        g = BaselineGrader(_regex(r"(a)b", r"(c)\1"), [], "")
+        self.assertIsNone(g._any_regex)
+        self.assertEqual(g.grade("cc")[0], 10.0)
+
+    def test_leading_flags_stay_scoped(self):
+        g = BaselineGrader(_regex(r"(?x) a b c # commentaire", r"hello world"), [], "")
+        self.assertIsNotNone(g._any_regex)
+        self.assertEqual(g.grade("hello world")[0], 10.0)
+        self.assertEqual(g.grade("ABC")[0], 10.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
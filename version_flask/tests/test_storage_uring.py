@@ -0,0 +1,155 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "flaskapp"))
+
+HAS_WERKZEUG = importlib.util.find_spec("werkzeug") is not None
+
+
+class _Entry:
+    def __init__(self, user_data, res):
+        self.user_data, self._res = user_data, res
+
+    @property
+    def res(self):
+        if self._res < 0:  # comme la liaison : errno négatif levé
+            raise OSError(-self._res, os.strerror(-self._res))
+        return self._res
+
+
+class _Ring:
+    def __init__(self):
+        self.pending, self.done = [], []
+
+
+class _Cqe:
+    ring = None
+
+    def __getitem__(self, i):
+        return self.ring.done[i]
+
+
+class FakeLiburing:
+    """Liaison liburing minimale : les opérations s'exécutent à la soumission."""
+    Ring = _Ring
+
+    def __init__(self, c_style_read: bool):
+        self.c_style_read = c_style_read
+        self.reads = 0
+        if c_style_read:
+            self.io_uring_prep_read = self._prep_read_c
+        else:
+            self.io_uring_prep_read = self._prep_read
+
+    def Cqe(self):
+        return _Cqe()
+
+    def io_uring_queue_init(self, entries, ring):
+        self.ring = ring
+
+    def io_uring_queue_exit(self, ring):
+        pass
+
+    def io_uring_get_sqe(self, ring):
+        sqe = mock.Mock()
+        ring.pending.append(sqe)
+        return sqe
+
+    def io_uring_prep_open(self, sqe, path, flags):
+        def op():
+            try:
+                return os.open(path, flags)
+            except OSError as e:
+                return -e.errno
+        sqe.op = op
+
+    def _read_into(self, sqe, fd, buf, nbytes):
+        def op():
+            self.reads += 1
+            data = os.pread(fd, nbytes, 0)
+            buf[:len(data)] = data
+            return len(data)
+        sqe.op = op
+
+    def _prep_read(self, sqe, fd, buf, offset=None):
+        self._read_into(sqe, fd, buf, len(buf))
+
+    def _prep_read_c(self, sqe, fd, buf, nbytes, offset):
+        self._read_into(sqe, fd, buf, nbytes)
+
+    def io_uring_prep_close(self, sqe, fd):
+        sqe.op = lambda: os.close(fd) or 0
+
+    def io_uring_submit_and_wait(self, ring, n):
+        ring.done = [_Entry(sqe.user_data, sqe.op()) for sqe in ring.pending]
+        ring.pending = []
+
+    def io_uring_wait_cqe(self, ring, cqe):
+        cqe.ring = ring
+
+    def io_uring_cq_ready(self, ring):
+        return len(ring.done)
+
+    def io_uring_cq_advance(self, ring, n):
+        ring.done = ring.done[n:]
+
+
+@unittest.skipUnless(HAS_WERKZEUG, "werkzeug requis par storage")
+class UringLoadTest(unittest.TestCase):
+    def setUp(self):
+        import storage
+        self.storage = storage
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.paths = []
+        for i in range(3):
+            path = os.path.join(self.tmp.name, f"{i}.pickle")
+            storage._atomic_dump({"n": i}, path)
+            storage._load_cache.pop(path, None)
+            self.paths.append(path)
+
+    def _use(self, fake):
+        patcher = mock.patch.multiple(self.storage, liburing=fake, _use_io_uring=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.storage._uring_prep_read = self.storage._probe_uring_read()
+        self.addCleanup(setattr, self.storage, "_uring_prep_read", None)
+
+    def test_reads_through_ring(self):
+        for c_style in (False, True):
+            with self.subTest(c_style_read=c_style):
+                fake = FakeLiburing(c_style)
+                self._use(fake)
+                for p in self.paths:
+                    self.storage._load_cache.pop(p, None)
+                with mock.patch.object(self.storage, "_atomic_load", side_effect=AssertionError):
+                    objs = self.storage._load_many(self.paths + [self.paths[0] + ".absent"])
+                self.assertEqual(objs, [{"n": 0}, {"n": 1}, {"n": 2}])
+                self.assertEqual(fake.reads, 3)
+
+    def test_grown_file_is_reread(self):
+        self._use(FakeLiburing(False))
+        real_stat = os.stat
+        def stale_stat(path, *a, **kw):
+            st = real_stat(path, *a, **kw)
+            if path == self.paths[1]:  # taille vue avant un remplacement plus grand
+                return os.stat_result((st.st_mode, 0, 0, 0, 0, 0, st.st_size - 1, 0, 0, 0))
+            return st
+        with mock.patch.object(self.storage.os, "stat", side_effect=stale_stat):
+            objs = self.storage._load_many_uring(self.paths)
+        self.assertEqual(objs, [{"n": 0}, {"n": 1}, {"n": 2}])
+
+    def test_broken_binding_falls_back(self):
+        fake = FakeLiburing(False)
+        self._use(fake)
+        fake.io_uring_queue_init = mock.Mock(side_effect=TypeError("API inconnue"))
+        self.assertEqual(self.storage._load_many(self.paths), [{"n": 0}, {"n": 1}, {"n": 2}])
+        self.assertFalse(self.storage._use_io_uring)
+
+
+if __name__ == "__main__":
+    unittest.main()